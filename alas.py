@@ -26,6 +26,8 @@ class AzurLaneAutoScript:
         # Failure count of tasks
         # Key: str, task name, value: int, failure count
         self.failure_record = {}
+        # Timestamp of last screenshot method auto tune
+        self.auto_tune_time = time.time()
 
     @cached_property
     def config(self):
@@ -149,6 +151,8 @@ class AzurLaneAutoScript:
                 image_time = datetime.strftime(data['time'], '%Y-%m-%d_%H-%M-%S-%f')
                 image = handle_sensitive_image(data['image'])
                 save_image(image, f'{folder}/{image_time}.png')
+            # File logs are written in background
+            logger.flush()
             with open(logger.log_file, 'r', encoding='utf-8') as f:
                 lines = f.readlines()
                 start = 0
@@ -156,7 +160,8 @@ class AzurLaneAutoScript:
                     line = line.strip(' \r\t\n')
                     if re.match('^═{15,}$', line):
                         start = index
-                lines = lines[start - 2:]
+                # Log file may be rotated after start
+                lines = lines[max(start - 2, 0):]
                 lines = handle_sensitive_logs(lines)
             with open(f'{folder}/log.txt', 'w', encoding='utf-8') as f:
                 f.writelines(lines)
@@ -394,6 +399,40 @@ class AzurLaneAutoScript:
         GemsFarming(config=self.config, device=self.device).run(
             name=self.config.Campaign_Name, folder=self.config.Campaign_Event, mode=self.config.Campaign_Mode)
 
+    def benchmark_auto_tune(self):
+        """
+        Sample screenshot methods and switch to a faster one, see AutoTune.
+        """
+        if not self.config.BENCHMARK_AUTO_TUNE:
+            return
+        if time.time() - self.auto_tune_time < self.config.BENCHMARK_AUTO_TUNE_INTERVAL:
+            return
+        from module.daemon.benchmark import AutoTune
+        try:
+            AutoTune(config=self.config, device=self.device).run()
+        except Exception as e:
+            logger.exception(e)
+        self.auto_tune_time = time.time()
+
+    def ocr_preload(self):
+        """
+        Load OCR models in background at scheduler start, see OcrModel.preload().
+        """
+        from module.webui.setting import State
+        if not self.config.OCR_PRELOAD or State.deploy_config.UseOcrServer:
+            return
+        from module.ocr.models import OCR_MODEL
+        logger.info(f'Preload OCR models: {self.config.OCR_PRELOAD}')
+        OCR_MODEL.preload(self.config.OCR_PRELOAD)
+
+    def ocr_cache_init(self):
+        """
+        Apply OCR_CACHE_SIZE in config, see OcrCache.
+        """
+        from module.ocr.cache import OCR_CACHE
+        OCR_CACHE.resize(self.config.OCR_CACHE_SIZE)
+        logger.info(f'Ocr cache size: {OCR_CACHE.size}')
+
     def wait_until(self, future):
         """
         Wait until a specific time.
@@ -409,15 +448,17 @@ class AzurLaneAutoScript:
         while 1:
             if datetime.now() > future:
                 return True
+            timeout = (future - datetime.now()).total_seconds()
             if self.stop_event is not None:
                 if self.stop_event.is_set():
                     logger.info("Update event detected")
                     logger.info(f"[{self.config_name}] exited. Reason: Update")
                     exit(0)
+                # Wake up regularly to check stop_event
+                timeout = min(timeout, 5)
 
-            time.sleep(5)
-
-            if self.config.should_reload():
+            if self.config.wait_reload(timeout=timeout):
+                logger.info(f'Changed tasks: {self.config.changed_tasks()}')
                 return False
 
     def get_next_task(self):
@@ -475,8 +516,11 @@ class AzurLaneAutoScript:
         return task.command
 
     def loop(self):
-        logger.set_file_logger(self.config_name)
+        logger.set_file_logger(
+            self.config_name, max_bytes=self.config.LOG_FILE_MAX_BYTES, compress=self.config.LOG_FILE_COMPRESS)
         logger.info(f'Start scheduler loop: {self.config_name}')
+        self.ocr_cache_init()
+        self.ocr_preload()
 
         while 1:
             # Check update event from GUI
@@ -514,6 +558,13 @@ class AzurLaneAutoScript:
             success = self.run(inflection.underscore(task))
             logger.info(f'Scheduler: End task `{task}`')
             self.is_first_task = False
+            from module.base.frame_cache import FRAME_CACHE
+            FRAME_CACHE.show()
+            FRAME_CACHE.clear_stats()
+            from module.ocr.cache import OCR_CACHE
+            OCR_CACHE.show()
+            OCR_CACHE.clear_stats()
+            self.benchmark_auto_tune()
 
             # Check failures
             failed = deep_get(self.failure_record, keys=task, default=0)
@@ -0,0 +1,73 @@
+import module.config.server as server
+
+server.server = 'cn'  # Don't need to edit, it's used to avoid error.
+
+from module.base.utils import location2node, node2location
+from module.logger import logger
+from module.map.map_base import CampaignMap
+
+"""
+This file checks routes chosen by path finding (CampaignMap.find_path_initial()) on a known map, outside Alas.
+Run it after modifying module/map/map_base.py or module/map/map_graph.py, routes of the cases below should not change.
+
+Path finding is Dijkstra since MapGraph, costs are true shortest paths.
+The old relaxation loop stopped once the visited grids stopped growing, before costs settled,
+so on some maps it gave higher costs and different routes.
+
+Usage:
+    python -m dev_tools.map_path_check
+"""
+
+# Same as campaign/campaign_main/campaign_7_2.py, copied to avoid importing the whole campaign module.
+MAP = CampaignMap('7-2')
+MAP.shape = 'H5'
+MAP.map_data = """
+    ME ++ ME -- ME ME -- SP
+    MM ++ ++ MM -- -- ME --
+    ME -- ME MB ME -- ME MM
+    -- ME -- MM -- ME ++ ++
+    SP -- ME ME -- ME ++ ++
+"""
+
+# (start, destination, enemies on map, expected cost, expected route)
+CASES = [
+    # Example in CampaignMap._find_path()
+    ('C3', 'H2', [], 24, ['C3', 'D3', 'E3', 'F3', 'G3', 'G2', 'H2']),
+    ('A5', 'H1', [], 47, ['A5', 'B5', 'C5', 'D5', 'D4', 'D3', 'D2', 'D1', 'E1', 'F1', 'G1', 'H1']),
+    ('A5', 'H1', ['E3', 'F4'], 47, ['A5', 'B5', 'C5', 'D5', 'D4', 'D3', 'D2', 'D1', 'E1', 'F1', 'G1', 'H1']),
+    # Enemies can be reached but not passed through
+    ('A5', 'G3', ['D5'], 35, ['A5', 'A4', 'A3', 'B3', 'C3', 'D3', 'E3', 'F3', 'G3']),
+]
+
+
+def check():
+    """
+    Returns:
+        bool: If all cases passed.
+    """
+    MAP.grid_connection_initial()
+    success = True
+    for start, end, enemies, cost, route in CASES:
+        MAP.reset()
+        for node in enemies:
+            MAP[node2location(node)].is_enemy = True
+        MAP.find_path_initial(node2location(start))
+        result = MAP._find_path(node2location(end))
+        result = [location2node(loca) for loca in result] if result is not None else None
+        result_cost = MAP[node2location(end)].cost
+
+        if result == route and result_cost == cost:
+            logger.info(f'Path {start} -> {end}, enemies={enemies}: cost={result_cost}, route={result}')
+        else:
+            logger.warning(f'Path {start} -> {end}, enemies={enemies}: cost={result_cost}, route={result}, '
+                           f'expected cost={cost}, route={route}')
+            success = False
+    return success
+
+
+if __name__ == '__main__':
+    if check():
+        logger.info('All path finding cases passed')
+    else:
+        logger.critical('Path finding cases failed')
+        exit(1)
@@ -0,0 +1,234 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+from rich.table import Table
+
+import module.config.server as server
+
+server.server = 'cn'  # Edit your server here, or use --server
+
+from module.base.frame_cache import FRAME_CACHE
+from module.base.utils import float2str, load_image
+from module.logger import logger
+
+"""
+This file replays recorded screenshots through detectors, outside Alas and without emulator.
+Use it to catch performance regressions and to compare branches.
+
+Screenshots can be the ones saved by `save_error_log()` in ./log/error/<timestamp>,
+or any folder of 1280x720 PNG files, replayed in file name order.
+
+Usage:
+    python -m dev_tools.replay_benchmark ./log/error/1700000000000
+    python -m dev_tools.replay_benchmark ./screenshots --server en --output report.json
+"""
+
+
+class ReplayFrameEnd(Exception):
+    """
+    Raised when a detector requests a new screenshot while a frame is being measured.
+    """
+    pass
+
+
+class ReplayDevice:
+    """
+    A fake Device that replays recorded screenshots.
+    Clicks and swipes are dropped, since there is nothing to interact with.
+    """
+
+    def __init__(self, config, files):
+        """
+        Args:
+            config (AzurLaneConfig):
+            files (list[str]): Screenshot files.
+        """
+        self.config = config
+        self.files = files
+        self.image = None
+        self.frozen = False
+        self.detect_record = set()
+        self.click_record = []
+
+    def load(self, file):
+        """
+        Args:
+            file (str): Screenshot file.
+
+        Returns:
+            np.ndarray:
+        """
+        self.image = load_image(file)
+        FRAME_CACHE.set_frame(self.image)
+        return self.image
+
+    def screenshot(self):
+        if self.frozen:
+            raise ReplayFrameEnd
+        return self.image
+
+    def click(self, button, control_check=True):
+        self.click_record.append(str(button))
+
+    def multi_click(self, button, n, interval=(0.1, 0.2)):
+        self.click(button)
+
+    def long_click(self, button, duration=(1, 1.2)):
+        self.click(button)
+
+    def swipe(self, *args, **kwargs):
+        pass
+
+    def swipe_vector(self, *args, **kwargs):
+        pass
+
+    def drag(self, *args, **kwargs):
+        pass
+
+    def sleep(self, second):
+        pass
+
+    def screenshot_interval_set(self, interval=None):
+        pass
+
+    def save_screenshot(self, *args, **kwargs):
+        return False
+
+    def stuck_record_add(self, button):
+        self.detect_record.add(str(button))
+
+    def stuck_record_clear(self):
+        self.detect_record = set()
+
+    def click_record_clear(self):
+        self.click_record = []
+
+    def app_is_running(self):
+        return True
+
+    def get_orientation(self):
+        return 0
+
+    def uninstall_minicap(self):
+        pass
+
+
+class ReplayBenchmark:
+    def __init__(self, folder, config_name='template'):
+        """
+        Args:
+            folder (str): Folder of screenshots.
+            config_name (str): User config to use.
+        """
+        from module.config.config import AzurLaneConfig
+        self.folder = folder
+        self.files = [os.path.join(folder, file) for file in sorted(os.listdir(folder))
+                      if file.lower().endswith('.png')]
+        self.config = AzurLaneConfig(config_name, task='Alas')
+        self.device = ReplayDevice(config=self.config, files=self.files)
+        # Key: function name, value: list of [cost, result]
+        # result can be 'success', 'failed', 'no_result'
+        self.record = {}
+
+    def measure(self, name, func, *args, **kwargs):
+        """
+        Args:
+            name (str): Function name to show in report.
+            func: Function to measure.
+        """
+        start = time.perf_counter()
+        try:
+            func(*args, **kwargs)
+            result = 'success'
+        except ReplayFrameEnd:
+            result = 'no_result'
+        except Exception as e:
+            logger.info(f'{name}: {e.__class__.__name__}: {e}')
+            result = 'failed'
+        cost = time.perf_counter() - start
+        self.record.setdefault(name, []).append([cost, result])
+
+    def run(self):
+        from module.campaign.campaign_status import OCR_COIN
+        from module.map_detection.view import View
+        from module.statistics.get_items import GetItemsStatistics
+        from module.ui.ui import UI
+
+        logger.hr('Replay benchmark', level=1)
+        logger.attr('Folder', self.folder)
+        logger.attr('Frames', len(self.files))
+        ui = UI(self.config, device=self.device)
+        view = View(self.config)
+        stats = GetItemsStatistics()
+
+        for index, file in enumerate(self.files):
+            logger.hr(f'Frame {index + 1}/{len(self.files)}: {os.path.basename(file)}', level=2)
+            image = self.device.load(file)
+            self.device.frozen = True
+            self.measure('ui_get_current_page', ui.ui_get_current_page, skip_first_screenshot=True)
+            self.measure('View.load', view.load, image)
+            self.measure('View.predict', view.predict)
+            self.measure('Ocr', OCR_COIN.ocr, image)
+            self.measure('stats_get_items', stats.stats_get_items, image)
+            self.device.frozen = False
+
+        self.show()
+        return self.report()
+
+    def report(self):
+        """
+        Returns:
+            dict: Key: function name, value: dict of statistics in seconds.
+        """
+        out = {}
+        for name, record in self.record.items():
+            costs = np.array([cost for cost, _ in record])
+            results = [result for _, result in record]
+            out[name] = {
+                'calls': len(record),
+                'success': results.count('success'),
+                'failed': results.count('failed'),
+                'no_result': results.count('no_result'),
+                'total': float(np.sum(costs)),
+                'mean': float(np.mean(costs)),
+                'p50': float(np.percentile(costs, 50)),
+                'p95': float(np.percentile(costs, 95)),
+                'max': float(np.max(costs)),
+            }
+        return out
+
+    def show(self):
+        table = Table(show_lines=True)
+        table.add_column('Function', header_style="bright_cyan", style="cyan", no_wrap=True)
+        for column in ['Calls', 'Success', 'Failed', 'No result', 'Mean', 'P50', 'P95', 'Max', 'Total']:
+            table.add_column(column, style="magenta")
+        for name, row in self.report().items():
+            table.add_row(
+                name,
+                str(row['calls']),
+                str(row['success']),
+                str(row['failed']),
+                str(row['no_result']),
+                *[f'{float2str(row[key])}s' for key in ['mean', 'p50', 'p95', 'max', 'total']]
+            )
+        logger.print(table, justify='center')
+        FRAME_CACHE.show()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay recorded screenshots and measure detector costs')
+    parser.add_argument('folder', type=str, help='Folder of screenshots, such as ./log/error/<timestamp>')
+    parser.add_argument('--config', type=str, default='template', help='User config to use')
+    parser.add_argument('--server', type=str, default='cn', help='Server of the screenshots, cn/en/jp/tw')
+    parser.add_argument('--output', type=str, default='', help='Save report to a json file')
+    args = parser.parse_args()
+
+    server.set_server(args.server)
+    report = ReplayBenchmark(args.folder, config_name=args.config).run()
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f'Report saved to {args.output}')
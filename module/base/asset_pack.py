@@ -0,0 +1,424 @@
+import json
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+import module.config.server as server
+
+
+class AssetPack:
+    """
+    Pre-cropped images of all Buttons and Templates in one uncompressed file per server,
+    with full images of template folders, such as item templates and masks.
+
+    Images are memory-mapped and returned as read-only views, so loading an asset costs no PNG decode,
+    and all Alas processes share the same physical pages, RAM won't grow with number of instances.
+    Images of source files modified after the pack was built are ignored, callers should fallback to PNG.
+
+    Files:
+        ./bin/asset_pack/<server>.json: Index.
+            data: Data file name.
+            sources: Key: assets.py and template folders, value: st_mtime_ns, to check if pack is outdated.
+            files: Key: source file, value: [st_mtime_ns, st_size]
+            images: Key: see key(), value: list of frames, [offset, shape, dtype]
+        ./bin/asset_pack/<server>.<build_time>.bin: Raw image data.
+            Each build writes a new data file, so running processes can keep mapping the old one.
+
+    Packs are built by GUI at startup, see start_asset_pack_process(),
+    or manually with `python -m module.base.asset_pack`.
+    """
+    FOLDER = './bin/asset_pack'
+    VERSION = 3
+    # Folders to pack full images, used by load_image()
+    IMAGE_FOLDERS = [
+        './assets/map_detection',
+        './assets/research_blueprint',
+        './assets/shop',
+        './assets/stats_basic',
+    ]
+    # Folders to pack full images as monochrome 'gray' variant only, used by Mask
+    MASK_FOLDERS = [
+        './assets/mask',
+    ]
+    # Seconds to wait before checking a missing pack again
+    RETRY_INTERVAL = 60
+
+    def __init__(self):
+        # Key: server, value: dict of "data", "files", "images", or None if pack not available.
+        self.packs = {}
+        # Key: server, value: time of the last failed load
+        self.failed = {}
+        # Key: (server, file), value: bool, whether source file is unchanged
+        self.verified = {}
+
+    @staticmethod
+    def key(file, area=None, variant='image'):
+        """
+        Args:
+            file (str): Source file.
+            area (tuple): Crop area, or None for full image.
+            variant (str): 'image', 'binary', 'luma', 'gray'.
+
+        Returns:
+            str:
+        """
+        file = os.path.normpath(file)
+        area = ','.join([str(int(x)) for x in area]) if area is not None else ''
+        return f'{file}|{area}|{variant}'
+
+    @classmethod
+    def index_file(cls, s):
+        return os.path.join(cls.FOLDER, f'{s}.json')
+
+    @classmethod
+    def sources(cls):
+        """
+        Returns:
+            dict: Key: assets.py and template folders, value: st_mtime_ns.
+                Adding or removing files in folders changes their mtime.
+        """
+        out = {}
+        for root, _, files in os.walk('./module'):
+            if 'assets.py' in files:
+                file = os.path.normpath(os.path.join(root, 'assets.py'))
+                out[file] = os.stat(file).st_mtime_ns
+        for folder in cls.IMAGE_FOLDERS + cls.MASK_FOLDERS:
+            for root, _, _ in os.walk(folder):
+                out[os.path.normpath(root)] = os.stat(root).st_mtime_ns
+        return out
+
+    def load(self, s):
+        """
+        Args:
+            s (str): Server.
+
+        Returns:
+            dict: Or None if pack not available.
+        """
+        pack = self.packs.get(s)
+        if pack is not None:
+            return pack
+        # Pack may be building by GUI, check again later
+        if time.time() - self.failed.get(s, 0) < self.RETRY_INTERVAL:
+            return None
+
+        try:
+            with open(self.index_file(s), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') == self.VERSION:
+                data_file = os.path.join(self.FOLDER, index['data'])
+                pack = {
+                    'data': np.memmap(data_file, dtype=np.uint8, mode='r'),
+                    'files': index['files'],
+                    'images': index['images'],
+                }
+        except (FileNotFoundError, ValueError, KeyError, OSError):
+            pack = None
+
+        if pack is None:
+            self.failed[s] = time.time()
+        else:
+            self.packs[s] = pack
+        return pack
+
+    def is_valid(self, s, pack, file):
+        key = (s, file)
+        if key not in self.verified:
+            try:
+                stat = os.stat(file)
+                self.verified[key] = pack['files'].get(os.path.normpath(file)) == [stat.st_mtime_ns, stat.st_size]
+            except OSError:
+                self.verified[key] = False
+        return self.verified[key]
+
+    def is_outdated(self, s):
+        """
+        Args:
+            s (str): Server.
+
+        Returns:
+            bool: If pack not exists or assets changed after building.
+        """
+        try:
+            with open(self.index_file(s), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') != self.VERSION:
+                return True
+            if not os.path.exists(os.path.join(self.FOLDER, index['data'])):
+                return True
+            if index['sources'] != self.sources():
+                return True
+            for file, stat in index['files'].items():
+                st = os.stat(file)
+                if [st.st_mtime_ns, st.st_size] != stat:
+                    return True
+        except (FileNotFoundError, ValueError, KeyError, OSError):
+            return True
+        return False
+
+    def get(self, file, area=None, variant='image'):
+        """
+        Args:
+            file (str): Source file.
+            area (tuple): Crop area, or None for full image.
+            variant (str): 'image', 'binary', 'luma', 'gray'.
+
+        Returns:
+            list[np.ndarray]: Read-only frames, or None if not packed.
+        """
+        s = server.server
+        pack = self.load(s)
+        if pack is None:
+            return None
+        frames = pack['images'].get(self.key(file, area, variant))
+        if frames is None or not self.is_valid(s, pack, file):
+            return None
+
+        data = pack['data']
+        return [np.ndarray(tuple(shape), dtype=np.dtype(dtype), buffer=data, offset=offset)
+                for offset, shape, dtype in frames]
+
+    def load_image(self, file):
+        """
+        Same as `load_image(file)` in module.base.utils, but use packed image if available.
+
+        Args:
+            file (str):
+
+        Returns:
+            np.ndarray: Read-only if packed.
+        """
+        frames = self.get(file)
+        if frames is not None:
+            return frames[0]
+        from module.base.utils import load_image
+        return load_image(file)
+
+    def clear(self):
+        self.packs = {}
+        self.failed = {}
+        self.verified = {}
+
+
+ASSET_PACK = AssetPack()
+
+
+class AssetPackBuilder:
+    # Align images to cache lines
+    ALIGN = 64
+
+    def __init__(self, s):
+        """
+        Args:
+            s (str): Server.
+        """
+        self.server = s
+        self.index_file = AssetPack.index_file(s)
+        self.data_name = f'{s}.{int(time.time() * 1000)}.bin'
+        self.data_file = os.path.join(AssetPack.FOLDER, self.data_name)
+        self.files = {}
+        self.images = {}
+        self.offset = 0
+        os.makedirs(AssetPack.FOLDER, exist_ok=True)
+        self.data = open(self.data_file, 'wb')
+
+    def add(self, file, images, area=None, variant='image'):
+        """
+        Args:
+            file (str): Source file.
+            images (np.ndarray, list[np.ndarray]): Image or gif frames.
+            area (tuple): Crop area, or None for full image.
+            variant (str): 'image', 'binary', 'luma', 'gray'.
+        """
+        if not isinstance(images, list):
+            images = [images]
+        frames = []
+        for image in images:
+            image = np.ascontiguousarray(image)
+            pad = -self.offset % self.ALIGN
+            if pad:
+                self.data.write(b'\0' * pad)
+                self.offset += pad
+            frames.append([self.offset, list(image.shape), image.dtype.str])
+            self.data.write(image.tobytes())
+            self.offset += image.nbytes
+
+        self.images[AssetPack.key(file, area, variant)] = frames
+        file = os.path.normpath(file)
+        if file not in self.files:
+            stat = os.stat(file)
+            self.files[file] = [stat.st_mtime_ns, stat.st_size]
+
+    def save(self, sources):
+        """
+        Args:
+            sources (dict): See AssetPack.sources(), collected before building.
+        """
+        self.data.close()
+        with open(f'{self.index_file}.tmp', 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': AssetPack.VERSION,
+                'data': self.data_name,
+                'sources': sources,
+                'files': self.files,
+                'images': self.images,
+            }, f)
+        # Replace index at last, processes reading the old index still get the old data file
+        os.replace(f'{self.index_file}.tmp', self.index_file)
+        self.remove_old()
+
+    def remove_old(self):
+        for file in os.listdir(AssetPack.FOLDER):
+            if file.startswith(f'{self.server}.') and file.endswith('.bin') and file != self.data_name:
+                try:
+                    os.remove(os.path.join(AssetPack.FOLDER, file))
+                except OSError:
+                    # Still mapped by running processes on Windows, remove it next time
+                    pass
+
+
+def import_assets():
+    """
+    Import all assets.py, so all Buttons and Templates are in Resource.instances.
+    """
+    import importlib
+    for root, _, files in os.walk('./module'):
+        if 'assets.py' in files:
+            module = os.path.normpath(os.path.join(root, 'assets')).replace(os.sep, '.')
+            importlib.import_module(module)
+
+
+def build_asset_pack(s):
+    """
+    Args:
+        s (str): Server.
+
+    Returns:
+        int: Number of assets packed.
+    """
+    from module.base.button import Button
+    from module.base.resource import Resource
+    from module.base.template import Template
+    from module.base.utils import image_channel, load_image, rgb2gray, rgb2luma
+    from module.logger import logger
+
+    logger.hr(f'Build asset pack: {s}', level=1)
+    sources = AssetPack.sources()
+    import_assets()
+    server.server = s
+    builder = AssetPackBuilder(s)
+    count = 0
+    for obj in list(Resource.instances.values()):
+        # Clear cached file and area of other servers
+        obj.resource_release()
+        try:
+            if isinstance(obj, Button):
+                if not obj.file:
+                    continue
+                image = obj.load_template_file()
+                images = image if isinstance(image, list) else [image]
+                builder.add(obj.file, images, area=obj.area)
+                builder.add(obj.file, [obj.to_binary(i) for i in images], area=obj.area, variant='binary')
+                builder.add(obj.file, [rgb2luma(i) for i in images], area=obj.area, variant='luma')
+            elif isinstance(obj, Template):
+                image = obj.load_template_file()
+                builder.add(obj.file, image)
+            else:
+                continue
+        except (FileNotFoundError, KeyError, OSError) as e:
+            logger.warning(f'Skip asset {obj}: {e}')
+            continue
+        count += 1
+        obj.resource_release()
+
+    for folder in AssetPack.IMAGE_FOLDERS:
+        for root, _, files in os.walk(folder):
+            for file in files:
+                if os.path.splitext(file)[1] != '.png':
+                    continue
+                file = os.path.join(root, file)
+                if AssetPack.key(file) in builder.images:
+                    continue
+                builder.add(file, load_image(file))
+                count += 1
+
+    for folder in AssetPack.MASK_FOLDERS:
+        for root, _, files in os.walk(folder):
+            for file in files:
+                if os.path.splitext(file)[1] != '.png':
+                    continue
+                file = os.path.join(root, file)
+                # Same as Mask.image
+                image = load_image(file)
+                if image_channel(image) == 3:
+                    image = rgb2gray(image)
+                builder.add(file, image, variant='gray')
+                count += 1
+
+    builder.save(sources)
+    logger.info(f'Packed {count} assets into {builder.data_file}, {builder.offset} bytes')
+    return count
+
+
+def instance_servers():
+    """
+    Returns:
+        list[str]: Servers used by existing Alas instance configs.
+            Instances with PackageName `auto` are skipped, package is written into config once detected.
+    """
+    from module.config.server import VALID_SERVER, to_server
+    from module.config.utils import alas_instance, deep_get, filepath_config, read_file
+    from module.submodule.utils import get_config_mod
+    servers = set()
+    for name in alas_instance():
+        if get_config_mod(name) != 'alas':
+            continue
+        package = deep_get(read_file(filepath_config(name)), keys='Alas.Emulator.PackageName', default='auto')
+        if package and package != 'auto':
+            servers.add(to_server(package))
+    return [s for s in VALID_SERVER if s in servers]
+
+
+def ensure_asset_pack(servers=None):
+    """
+    Build outdated asset packs.
+
+    Args:
+        servers (list[str]): Default to servers used by instances, see instance_servers().
+    """
+    from module.logger import logger
+    if servers is None:
+        servers = instance_servers()
+    if not servers:
+        logger.info('No instance with known server, skip building asset pack')
+    for s in servers:
+        if ASSET_PACK.is_outdated(s):
+            try:
+                build_asset_pack(s)
+            except Exception as e:
+                logger.exception(e)
+        else:
+            logger.info(f'Asset pack is up to date: {s}')
+
+
+def start_asset_pack_process():
+    """
+    Build outdated asset packs of servers in use in background, called by GUI at startup.
+    Alas processes use packs once ready, and load from PNG files before that.
+    """
+    process = multiprocessing.Process(target=ensure_asset_pack, daemon=True)
+    process.start()
+    return process
+
+
+if __name__ == '__main__':
+    import argparse
+    from module.config.server import VALID_SERVER
+
+    parser = argparse.ArgumentParser(description='Build pre-cropped asset packs')
+    parser.add_argument('--server', nargs='*', default=list(VALID_SERVER), help='Servers to build, default to all')
+    args = parser.parse_args()
+    for s in args.server:
+        build_asset_pack(s)
@@ -1,5 +1,6 @@
-from module.base.button import Button
+from module.base.button import Button, ButtonSet
 from module.base.decorator import cached_property
+from module.base.frame_cache import FRAME_CACHE
 from module.base.timer import Timer
 from module.base.utils import *
 from module.combat.emotion import Emotion
@@ -118,6 +119,35 @@ class ModuleBase:
 
         return appear
 
+    def appear_any(self, buttons, offset=0, threshold=None):
+        """
+        Detect a group of buttons on the current screenshot in one pass.
+
+        Args:
+            buttons (ButtonSet, list[Button]):
+            offset (bool, int, tuple):
+            threshold (int, float): 0 to 1 if use offset, bigger means more similar,
+                0 to 255 if not use offset, smaller means more similar
+
+        Returns:
+            Button: The first button that appears, or None.
+        """
+        if not isinstance(buttons, ButtonSet):
+            buttons = ButtonSet(buttons)
+        for button in buttons:
+            self.device.stuck_record_add(button)
+
+        if offset:
+            if isinstance(offset, bool):
+                offset = self.config.BUTTON_OFFSET
+            if threshold is None:
+                threshold = self.config.BUTTON_MATCH_SIMILARITY
+        else:
+            if threshold is None:
+                threshold = self.config.COLOR_SIMILAR_THRESHOLD
+
+        return buttons.first_appear(self.device.image, offset=offset, threshold=threshold)
+
     def appear_then_click(self, button, screenshot=False, genre='items', offset=0, interval=0, threshold=None):
         button = self.ensure_button(button)
         appear = self.appear(button, offset=offset, interval=interval, threshold=threshold)
@@ -180,11 +210,11 @@ class ModuleBase:
             copy:
         """
         if isinstance(button, Button):
-            return crop(self.device.image, button.area, copy=copy)
+            return FRAME_CACHE.crop(self.device.image, button.area, copy=copy)
         elif hasattr(button, 'area'):
-            return crop(self.device.image, button.area, copy=copy)
+            return FRAME_CACHE.crop(self.device.image, button.area, copy=copy)
         else:
-            return crop(self.device.image, button, copy=copy)
+            return FRAME_CACHE.crop(self.device.image, button, copy=copy)
 
     def image_color_count(self, button, color, threshold=221, count=50):
         """
@@ -4,7 +4,9 @@ import traceback
 import imageio
 from PIL import ImageDraw
 
+from module.base.asset_pack import ASSET_PACK
 from module.base.decorator import cached_property
+from module.base.frame_cache import FRAME_CACHE
 from module.base.resource import Resource
 from module.base.utils import *
 from module.config.server import VALID_SERVER
@@ -39,6 +41,8 @@ class Button(Resource):
         self._match_init = False
         self._match_binary_init = False
         self._match_luma_init = False
+        # Whether image is loaded from asset pack, binary and luma images can be loaded too
+        self._image_packed = False
         self.image = None
         self.image_binary = None
         self.image_luma = None
@@ -112,7 +116,7 @@ class Button(Resource):
             bool: True if button appears on screenshot.
         """
         return color_similar(
-            color1=get_color(image, self.area),
+            color1=FRAME_CACHE.get_color(image, self.area),
             color2=self.color,
             threshold=threshold
         )
@@ -129,6 +133,7 @@ class Button(Resource):
         """
         self.__dict__['color'] = get_color(image, self.area)
         self.image = crop(image, self.area)
+        self._image_packed = False
         self.__dict__['is_gif'] = False
         return self.color
 
@@ -145,20 +150,53 @@ class Button(Resource):
     def clear_offset(self):
         self._button_offset = None
 
+    def load_template_file(self):
+        """
+        Decode asset image from file.
+
+        Returns:
+            np.ndarray: Or list of frames if it's gif.
+        """
+        if self.is_gif:
+            images = []
+            for image in imageio.mimread(self.file):
+                image = image[:, :, :3].copy() if len(image.shape) == 3 else image
+                image = crop(image, self.area)
+                images.append(image)
+            return images
+        else:
+            return load_image(self.file, self.area)
+
+    def load_packed(self, variant='image'):
+        """
+        Load asset image from asset pack.
+
+        Args:
+            variant (str): 'image', 'binary', 'luma'.
+
+        Returns:
+            np.ndarray: Or list of frames if it's gif, or None if not packed.
+        """
+        frames = ASSET_PACK.get(self.file, self.area, variant=variant)
+        if frames is None:
+            return None
+        return frames if self.is_gif else frames[0]
+
+    @staticmethod
+    def to_binary(image):
+        image_gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        _, image_binary = cv2.threshold(image_gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        return image_binary
+
     def ensure_template(self):
         """
         Load asset image.
         If needs to call self.match, call this first.
         """
         if not self._match_init:
-            if self.is_gif:
-                self.image = []
-                for image in imageio.mimread(self.file):
-                    image = image[:, :, :3].copy() if len(image.shape) == 3 else image
-                    image = crop(image, self.area)
-                    self.image.append(image)
-            else:
-                self.image = load_image(self.file, self.area)
+            image = self.load_packed()
+            self._image_packed = image is not None
+            self.image = image if image is not None else self.load_template_file()
             self._match_init = True
 
     def ensure_binary_template(self):
@@ -167,30 +205,29 @@ class Button(Resource):
         If needs to call self.match, call this first.
         """
         if not self._match_binary_init:
-            if self.is_gif:
-                self.image_binary = []
-                for image in self.image:
-                    image_gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-                    _, image_binary = cv2.threshold(image_gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
-                    self.image_binary.append(image_binary)
+            image = self.load_packed('binary') if self._image_packed else None
+            if image is not None:
+                self.image_binary = image
+            elif self.is_gif:
+                self.image_binary = [self.to_binary(image) for image in self.image]
             else:
-                image_gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
-                _, self.image_binary = cv2.threshold(image_gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+                self.image_binary = self.to_binary(self.image)
             self._match_binary_init = True
 
     def ensure_luma_template(self):
         if not self._match_luma_init:
-            if self.is_gif:
-                self.image_luma = []
-                for image in self.image:
-                    luma = rgb2luma(image)
-                    self.image_luma.append(luma)
+            image = self.load_packed('luma') if self._image_packed else None
+            if image is not None:
+                self.image_luma = image
+            elif self.is_gif:
+                self.image_luma = [rgb2luma(image) for image in self.image]
             else:
                 self.image_luma = rgb2luma(self.image)
             self._match_luma_init = True
 
     def resource_release(self):
         super().resource_release()
+        self._image_packed = False
         self.image = None
         self.image_binary = None
         self.image_luma = None
@@ -209,16 +246,40 @@ class Button(Resource):
         Returns:
             bool.
         """
-        self.ensure_template()
+        offset = self.match_offset(offset)
+        image = FRAME_CACHE.crop(image, offset + self.area, copy=False)
+        return self.match_search(image, offset, threshold=threshold)
+
+    @staticmethod
+    def match_offset(offset):
+        """
+        Args:
+            offset (int, tuple): Detection area offset, see match().
 
+        Returns:
+            np.ndarray: (x1, y1, x2, y2) to add to button area.
+        """
         if isinstance(offset, tuple):
             if len(offset) == 2:
-                offset = np.array((-offset[0], -offset[1], offset[0], offset[1]))
+                return np.array((-offset[0], -offset[1], offset[0], offset[1]))
             else:
-                offset = np.array(offset)
+                return np.array(offset)
         else:
-            offset = np.array((-3, -offset, 3, offset))
-        image = crop(image, offset + self.area, copy=False)
+            return np.array((-3, -offset, 3, offset))
+
+    def match_search(self, image, offset, threshold=0.85):
+        """
+        Template matching on a cropped search area.
+
+        Args:
+            image (np.ndarray): Search area, `offset + self.area` cropped from screenshot.
+            offset (np.ndarray): Result of match_offset().
+            threshold (float): 0-1. Similarity.
+
+        Returns:
+            bool.
+        """
+        self.ensure_template()
 
         if self.is_gif:
             for template in self.image:
@@ -256,7 +317,7 @@ class Button(Resource):
                 offset = np.array(offset)
         else:
             offset = np.array((-3, -offset, 3, offset))
-        image = crop(image, offset + self.area, copy=False)
+        image = FRAME_CACHE.crop(image, offset + self.area, copy=False)
 
         if self.is_gif:
             for template in self.image_binary:
@@ -304,10 +365,9 @@ class Button(Resource):
                 offset = np.array(offset)
         else:
             offset = np.array((-3, -offset, 3, offset))
-        image = crop(image, offset + self.area, copy=False)
+        image_luma = FRAME_CACHE.rgb2luma(image, offset + self.area)
 
         if self.is_gif:
-            image_luma = rgb2luma(image)
             for template in self.image_luma:
                 res = cv2.matchTemplate(template, image_luma, cv2.TM_CCOEFF_NORMED)
                 _, similarity, _, point = cv2.minMaxLoc(res)
@@ -315,7 +375,6 @@ class Button(Resource):
                 if similarity > threshold:
                     return True
         else:
-            image_luma = rgb2luma(image)
             res = cv2.matchTemplate(self.image_luma, image_luma, cv2.TM_CCOEFF_NORMED)
             _, similarity, _, point = cv2.minMaxLoc(res)
             self._button_offset = area_offset(self._button, offset[:2] + np.array(point))
@@ -332,7 +391,7 @@ class Button(Resource):
         """
         diff = np.subtract(self.button, self._button)[:2]
         area = area_offset(self.area, offset=diff)
-        return color_similar(color1=get_color(image, area), color2=self.color, threshold=threshold)
+        return color_similar(color1=FRAME_CACHE.get_color(image, area), color2=self.color, threshold=threshold)
 
     def crop(self, area, image=None, name=None):
         """
@@ -395,6 +454,176 @@ class Button(Resource):
         return out
 
 
+class ButtonSet:
+    def __init__(self, buttons, name='BUTTON_SET'):
+        """
+        A group of buttons to be detected on the same screenshot in one pass.
+
+        Args:
+            buttons (iterable[Button]):
+            name (str):
+
+        Examples:
+            PAGE_CHECK = ButtonSet([MAIN_CHECK, CAMPAIGN_CHECK, FLEET_CHECK])
+            appear, offset = PAGE_CHECK.detect(image)
+            button = PAGE_CHECK.first_appear(image, offset=(30, 30))
+        """
+        self.buttons = list(buttons)
+        self.name = name
+
+    def __str__(self):
+        return self.name
+
+    __repr__ = __str__
+
+    def __len__(self):
+        return len(self.buttons)
+
+    def __iter__(self):
+        return iter(self.buttons)
+
+    @cached_property
+    def areas(self):
+        """
+        Returns:
+            np.ndarray: Shape (n, 4), areas of all buttons.
+        """
+        areas = [button.area for button in self.buttons]
+        return np.round(np.array(areas, dtype=float).reshape(-1, 4)).astype(int)
+
+    @cached_property
+    def colors(self):
+        """
+        Returns:
+            np.ndarray: Shape (n, 3), expected colors of all buttons.
+        """
+        colors = [button.color for button in self.buttons]
+        return np.array(colors, dtype=int).reshape(-1, 3)
+
+    def get_colors(self, image):
+        """
+        Calculate the average colors of all button areas, using an integral image.
+        Cost is a single pass over the screenshot, no matter how many buttons there are.
+        Results are the same as calling `get_color()` on each area.
+
+        Args:
+            image (np.ndarray): Screenshot.
+
+        Returns:
+            np.ndarray: Shape (n, 3), (r, g, b) of each area.
+        """
+        h, w = image.shape[:2]
+        integral = FRAME_CACHE.cached(image, ('integral',), lambda: cv2.integral(image))
+        if integral.ndim == 2:
+            integral = integral[:, :, np.newaxis]
+        areas = self.areas
+        # Pixels outside of image are treated as black, like `crop()` does.
+        x1, x2 = np.clip(areas[:, 0], 0, w), np.clip(areas[:, 2], 0, w)
+        y1, y2 = np.clip(areas[:, 1], 0, h), np.clip(areas[:, 3], 0, h)
+        x2, y2 = np.maximum(x1, x2), np.maximum(y1, y2)
+        total = integral[y2, x2] - integral[y1, x2] - integral[y2, x1] + integral[y1, x1]
+        size = np.maximum(areas[:, 2] - areas[:, 0], 0) * np.maximum(areas[:, 3] - areas[:, 1], 0)
+        color = total / np.maximum(size, 1)[:, np.newaxis]
+        if color.shape[1] < 3:
+            color = np.pad(color, ((0, 0), (0, 3 - color.shape[1])))
+        return color[:, :3]
+
+    def appear_on(self, image, threshold=10):
+        """
+        Vectorized `Button.appear_on()` on all buttons.
+
+        Args:
+            image (np.ndarray): Screenshot.
+            threshold (int): Default to 10.
+
+        Returns:
+            np.ndarray: Shape (n,), bool, if each button appears.
+        """
+        # Same as color_similar(), which truncates average colors to int
+        diff = self.get_colors(image).astype(int) - self.colors
+        diff = np.max(np.maximum(diff, 0), axis=1) - np.min(np.minimum(diff, 0), axis=1)
+        return diff <= threshold
+
+    def detect(self, image, offset=0, threshold=None):
+        """
+        Detect all buttons on a screenshot.
+
+        Args:
+            image (np.ndarray): Screenshot.
+            offset (int, tuple): Detection area offset, 0 for color detection, see `Button.match()`.
+            threshold (int, float): 0 to 1 if use offset, bigger means more similar,
+                0 to 255 if not use offset, smaller means more similar
+
+        Returns:
+            np.ndarray: Shape (n,), bool, if each button appears.
+            np.ndarray: Shape (n, 2), (x, y) that each button moved from its original position.
+                Zeros if not using offset.
+        """
+        offsets = np.zeros((len(self.buttons), 2), dtype=int)
+        if not offset:
+            if threshold is None:
+                threshold = 10
+            return self.appear_on(image, threshold=threshold), offsets
+
+        if threshold is None:
+            threshold = 0.85
+        # Template sizes are different, so matching can't be stacked into one array.
+        offset, searches = self.search_areas(image, offset)
+        appear = np.zeros(len(self.buttons), dtype=bool)
+        for index, (button, search) in enumerate(zip(self.buttons, searches)):
+            appear[index] = button.match_search(search, offset, threshold=threshold)
+            offsets[index] = np.subtract(button.button, button._button)[:2]
+        return appear, offsets
+
+    def search_areas(self, image, offset):
+        """
+        Crop the union of all search areas once, cached on current frame,
+        and slice search areas of each button from it as views.
+        Results are the same as cropping `offset + button.area` one by one.
+
+        Args:
+            image (np.ndarray): Screenshot.
+            offset (int, tuple): Detection area offset, see `Button.match()`.
+
+        Returns:
+            np.ndarray: Result of `Button.match_offset()`.
+            list[np.ndarray]: Search area of each button.
+        """
+        offset = Button.match_offset(offset)
+        areas = self.areas + offset
+        union = np.append(areas[:, :2].min(axis=0), areas[:, 2:].max(axis=0))
+        search = FRAME_CACHE.crop(image, union, copy=False)
+        areas = areas - np.tile(union[:2], 2)
+        return offset, [search[y1:y2, x1:x2] for x1, y1, x2, y2 in areas]
+
+    def first_appear(self, image, offset=0, threshold=None):
+        """
+        Args:
+            image (np.ndarray): Screenshot.
+            offset (int, tuple): Detection area offset, 0 for color detection, see `Button.match()`.
+            threshold (int, float): 0 to 1 if use offset, bigger means more similar,
+                0 to 255 if not use offset, smaller means more similar
+
+        Returns:
+            Button: The first button that appears in order, or None if none of them appears.
+        """
+        if not offset:
+            if threshold is None:
+                threshold = 10
+            appear = np.where(self.appear_on(image, threshold=threshold))[0]
+            if len(appear):
+                return self.buttons[appear[0]]
+            return None
+
+        if threshold is None:
+            threshold = 0.85
+        offset, searches = self.search_areas(image, offset)
+        for button, search in zip(self.buttons, searches):
+            if button.match_search(search, offset, threshold=threshold):
+                return button
+        return None
+
+
 class ButtonGrid:
     def __init__(self, origin, delta, button_shape, grid_shape, name=None):
         self.origin = np.array(origin)
@@ -0,0 +1,122 @@
+from module.base.utils import *
+
+
+class FrameCache:
+    """
+    Memoize image operations on the latest screenshot.
+
+    Handlers usually ask about the same area of the same screenshot again and again,
+    such as getting colors of buttons and cropping OCR areas.
+    Results are keyed on (operation, area, arguments) and only valid for the current frame,
+    images that are not the current frame are computed directly without caching.
+
+    `Screenshot.screenshot()` calls `set_frame()` on every new screenshot,
+    which invalidates all cached results.
+
+    Arrays returned from cache are shared between callers, don't modify them in-place.
+    """
+
+    def __init__(self):
+        self.frame = None
+        self.frame_id = 0
+        self.cache = {}
+        self.hit = 0
+        self.miss = 0
+
+    def set_frame(self, image):
+        """
+        Args:
+            image (np.ndarray): New screenshot.
+        """
+        self.frame = image
+        self.frame_id += 1
+        self.cache.clear()
+
+    def clear(self):
+        self.frame = None
+        self.cache.clear()
+
+    def clear_stats(self):
+        self.hit = 0
+        self.miss = 0
+
+    def is_frame(self, image):
+        return self.frame is not None and image is self.frame
+
+    def cached(self, image, key, func):
+        """
+        Args:
+            image (np.ndarray): Screenshot.
+            key (tuple): Operation and its arguments.
+            func (callable): Function to call if not cached.
+
+        Returns:
+            Result of func.
+        """
+        if not self.is_frame(image):
+            return func()
+        try:
+            result = self.cache[key]
+            self.hit += 1
+            return result
+        except KeyError:
+            self.miss += 1
+            result = self.cache[key] = func()
+            return result
+
+    @staticmethod
+    def area_key(area):
+        return tuple(map(int, map(round, area)))
+
+    def crop(self, image, area, copy=True):
+        """
+        Same as `crop()`, but cached on current frame.
+        """
+        area = self.area_key(area)
+        image = self.cached(image, ('crop', area), lambda: crop(image, area, copy=False))
+        if copy:
+            image = image.copy()
+        return image
+
+    def get_color(self, image, area):
+        """
+        Same as `get_color()`, but cached on current frame.
+        """
+        area = self.area_key(area)
+        return self.cached(image, ('get_color', area), lambda: get_color(image, area))
+
+    def rgb2luma(self, image, area):
+        """
+        Same as `rgb2luma(crop(image, area))`, but cached on current frame.
+        """
+        area = self.area_key(area)
+        return self.cached(image, ('rgb2luma', area), lambda: rgb2luma(self.crop(image, area, copy=False)))
+
+    def rgb2gray(self, image, area):
+        """
+        Same as `rgb2gray(crop(image, area))`, but cached on current frame.
+        """
+        area = self.area_key(area)
+        return self.cached(image, ('rgb2gray', area), lambda: rgb2gray(self.crop(image, area, copy=False)))
+
+    def extract_letters(self, image, area, letter=(255, 255, 255), threshold=128):
+        """
+        Same as `extract_letters(crop(image, area), letter, threshold)`, but cached on current frame.
+        """
+        area = self.area_key(area)
+        letter = tuple(letter)
+        return self.cached(
+            image, ('extract_letters', area, letter, threshold),
+            lambda: extract_letters(self.crop(image, area, copy=False), letter=letter, threshold=threshold))
+
+    @property
+    def hit_rate(self):
+        total = self.hit + self.miss
+        return self.hit / total if total else 0.
+
+    def show(self):
+        from module.logger import logger
+        logger.info(f'Frame cache: hit={self.hit}, miss={self.miss}, hit_rate={float2str(self.hit_rate)}')
+
+
+FRAME_CACHE = FrameCache()
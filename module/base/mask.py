@@ -1,6 +1,7 @@
 import cv2
 import numpy as np
 
+from module.base.asset_pack import ASSET_PACK
 from module.base.template import Template
 from module.base.utils import image_channel, load_image, rgb2gray
 
@@ -9,9 +10,15 @@ class Mask(Template):
     @property
     def image(self):
         if self._image is None:
-            image = load_image(self.file)
+            # Masks in AssetPack.MASK_FOLDERS are packed in monochrome
+            frames = ASSET_PACK.get(self.file, variant='gray')
+            if frames is None:
+                frames = ASSET_PACK.get(self.file)
+            self._image_packed = frames is not None
+            image = frames[0] if frames is not None else load_image(self.file)
             if image_channel(image) == 3:
                 image = rgb2gray(image)
+                self._image_packed = False
             self._image = image
 
         return self._image
@@ -34,10 +41,12 @@ class Mask(Template):
                 return False
             else:
                 self._image, _, _ = cv2.split(self._image)
+                self._image_packed = False
                 return True
         else:
             if mask_channel == 0:
                 self._image = cv2.merge([self._image] * 3)
+                self._image_packed = False
                 return True
             else:
                 return False
@@ -43,6 +43,8 @@ class Resource:
     instances = {}
     # Instance property, record cached properties of instance
     cached = []
+    # Instance property, whether images are mapped from asset pack
+    _image_packed = False
 
     def resource_add(self, key):
         Resource.instances[key] = self
@@ -113,6 +115,9 @@ def release_resources(next_task=''):
         # Preserve assets for ui switching
         if next_task and str(obj) in _preserved_assets.ui:
             continue
+        # Images mapped from asset pack are shared by all processes, releasing them saves nothing
+        if obj._image_packed:
+            continue
         # if Resource.is_loaded(obj):
         #     logger.info(f'Release {obj}')
         obj.resource_release()
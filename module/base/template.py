@@ -2,6 +2,7 @@ import os
 
 import imageio
 
+from module.base.asset_pack import ASSET_PACK
 from module.base.button import Button
 from module.base.decorator import cached_property
 from module.base.resource import Resource
@@ -19,6 +20,7 @@ class Template(Resource):
         self.raw_file = file
         self._image = None
         self._image_binary = None
+        self._image_packed = False
 
         self.resource_add(self.file)
 
@@ -36,25 +38,47 @@ class Template(Resource):
     def is_gif(self):
         return os.path.splitext(self.file)[1] == '.gif'
 
+    def load_template_file(self):
+        """
+        Decode template image from file, before pre_process().
+
+        Returns:
+            np.ndarray: Or list of frames if it's gif.
+        """
+        if self.is_gif:
+            images = []
+            channel = 0
+            for image in imageio.mimread(self.file):
+                if not channel:
+                    channel = len(image.shape)
+                if channel == 3:
+                    image = image[:, :, :3].copy()
+                elif len(image.shape) == 3:
+                    # Follow the first frame
+                    image = image[:, :, 0].copy()
+                images.append(image)
+            return images
+        else:
+            return load_image(self.file)
+
     @property
     def image(self):
         if self._image is None:
+            images = ASSET_PACK.get(self.file)
+            # Flipped gif frames are not shared
+            self._image_packed = images is not None and not self.is_gif
+            if images is None:
+                images = self.load_template_file()
+            elif not self.is_gif:
+                images = images[0]
+
             if self.is_gif:
                 self._image = []
-                channel = 0
-                for image in imageio.mimread(self.file):
-                    if not channel:
-                        channel = len(image.shape)
-                    if channel == 3:
-                        image = image[:, :, :3].copy()
-                    elif len(image.shape) == 3:
-                        # Follow the first frame
-                        image = image[:, :, 0].copy()
-
+                for image in images:
                     image = self.pre_process(image)
                     self._image += [image, cv2.flip(image, 1)]
             else:
-                self._image = self.pre_process(load_image(self.file))
+                self._image = self.pre_process(images)
 
         return self._image
 
@@ -79,6 +103,7 @@ class Template(Resource):
 
     def resource_release(self):
         super().resource_release()
+        self._image_packed = False
         self._image = None
 
     def pre_process(self, image):
@@ -94,6 +94,40 @@ class ManualConfig:
     MAATOUCH_FILEPATH_LOCAL = './bin/MaaTouch/maatouch'
     MAATOUCH_FILEPATH_REMOTE = '/data/local/tmp/maatouch'
 
+    # Capture and decode screenshots in a background thread,
+    # screenshot() returns the freshest frame taken after the last click or swipe.
+    SCREENSHOT_PIPELINE = False
+    # Amount of frames kept in the ring buffer of screenshot pipeline
+    SCREENSHOT_PIPELINE_BUFFER = 3
+    # Decode ADB_nc and DroidCast_raw screenshots into the same output array every time.
+    # Previous screenshots are overwritten, don't keep references to `device.image` across screenshots.
+    # No effect if SCREENSHOT_PIPELINE is enabled.
+    SCREENSHOT_REUSE_BUFFER = False
+    # Increase screenshot interval when screen is static, and reset it once screen changes or after clicks
+    SCREENSHOT_ADAPTIVE_INTERVAL = False
+    # Mean luma difference (0-255) of downsampled screenshots, lower than this is considered static
+    SCREENSHOT_ADAPTIVE_THRESHOLD = 1.0
+    # Maximum screenshot interval in seconds, key is the interval name in screenshot_interval_set()
+    # 'default' for Optimization_ScreenshotInterval, 'combat' for Optimization_CombatScreenshotInterval
+    SCREENSHOT_ADAPTIVE_MAXIMUM = {
+        'default': 0.6,
+        'combat': 2.0,
+    }
+
+    """
+    module.daemon.benchmark
+    """
+    # Sample screenshot methods between tasks and switch to a faster one automatically
+    BENCHMARK_AUTO_TUNE = False
+    # Seconds between two samplings
+    BENCHMARK_AUTO_TUNE_INTERVAL = 3600
+    # Screenshots to take on each method in one sampling
+    BENCHMARK_AUTO_TUNE_SAMPLES = 5
+    # Length of the rolling window of time costs on each method
+    BENCHMARK_AUTO_TUNE_WINDOW = 100
+    # Switch only if another method is faster than current one by this ratio on p50, and also faster on p95
+    BENCHMARK_AUTO_TUNE_MARGIN = 0.2
+
     """
     module.campaign.gems_farming
     """
@@ -110,6 +144,14 @@ class ManualConfig:
     # Don't click SKIP at the situation above
     STORY_ALLOW_SKIP = True
 
+    """
+    module.logger
+    """
+    # Rotate log file of the day once it exceeds this size in bytes, 0 to rotate daily only
+    LOG_FILE_MAX_BYTES = 0
+    # Gzip rotated log files
+    LOG_FILE_COMPRESS = False
+
     """
     module.map.fleet
     """
@@ -172,6 +214,8 @@ class ManualConfig:
     MAP_SWIPE_PREDICT = True
     MAP_SWIPE_PREDICT_WITH_CURRENT_FLEET = True
     MAP_SWIPE_PREDICT_WITH_SEA_GRIDS = False
+    # Minimum response of phase correlation, when predicting swipe with sea grids
+    MAP_SWIPE_PREDICT_PHASE_RESPONSE = 0.05
     # Corner to ensure in ensure_edge_insight.
     # Value can be 'upper-left', 'upper-right', 'bottom-left', 'bottom-right', or 'upper', 'bottom', 'left', 'right'
     # Missing axis will be random, and '' for all random
@@ -194,6 +238,9 @@ class ManualConfig:
     DETECTION_BACKEND = 'homography'
     # In event_20200723_cn B3D3, Grid have 1.2x width, images on the grid still remain the same.
     GRID_IMAGE_A_MULTIPLY = 1.0
+    # Predict all grids in one pass on a tile atlas, see GridBatchPredictor
+    # Edge pixels of the atlas differ from per-grid crops, not yet verified to give identical predictions
+    GRID_PREDICT_BATCH = False
 
     """
     module.map_detection.homography
@@ -208,6 +255,10 @@ class ManualConfig:
     HOMO_CENTER_THRESHOLD = 0.8
     HOMO_CORNER_THRESHOLD = 0.8
     HOMO_RECTANGLE_THRESHOLD = 10
+    # After map swipes, search free tile around the predicted position first,
+    # fallback to full search if not found.
+    HOMO_INCREMENTAL = True
+    HOMO_INCREMENTAL_RADIUS = 30
 
     HOMO_EDGE_DETECT = True
     HOMO_EDGE_HOUGHLINES_THRESHOLD = 180
@@ -250,6 +301,15 @@ class ManualConfig:
     MID_DIFF_RANGE_H = (129 - 3, 129 + 3)
     MID_DIFF_RANGE_V = (129 - 3, 129 + 3)
 
+    """
+    module.ocr
+    """
+    # OCR models to load in background at scheduler start, so the first OCR won't wait for model loading
+    # Empty to disable, models are still loaded on first use
+    OCR_PRELOAD = ['azur_lane']
+    # Max pre-processed images in OCR result cache, see OcrCache. 0 to disable
+    OCR_CACHE_SIZE = 256
+
     """
     module.os
     """
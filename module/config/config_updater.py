@@ -1,8 +1,14 @@
+import hashlib
+import json
+import os
 import re
+import threading
+import time
 import typing as t
 from copy import deepcopy
 
 from cached_property import cached_property
+from filelock import FileLock
 
 from deploy.utils import DEPLOY_TEMPLATE, poor_yaml_read, poor_yaml_write
 from module.base.timer import timer
@@ -512,6 +518,117 @@ class ConfigGenerator:
         self.generate_deploy_template()
 
 
+class ConfigCacheEntry:
+    def __init__(self, stat, digest, old, new):
+        """
+        Args:
+            stat (tuple): (st_mtime_ns, st_size) of config file.
+            digest (str): Hash of file content.
+            old (dict): User config before update.
+            new (dict): User config after update.
+        """
+        self.stat = stat
+        self.digest = digest
+        self.old = old
+        self.new = new
+
+
+class ConfigCache:
+    """
+    Cache updated user configs, so config_update() is skipped when config file didn't change.
+
+    Config is reloaded after every task and on every GUI refresh,
+    but file changes only when user modifies settings or task finished.
+    - If mtime and size didn't change, the cached result is reused without reading file.
+    - If content hash didn't change, file is read but not updated.
+    - Otherwise, only the changed arguments are loaded, see ConfigUpdater.config_update_incremental().
+    """
+    # A file modified within this seconds may be modified again without changing mtime,
+    # due to the mtime precision of file systems, read it anyway.
+    RACY_SECONDS = 2
+
+    def __init__(self):
+        # Key: (file, is_template), value: ConfigCacheEntry
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.hit = 0
+        self.miss = 0
+
+    @staticmethod
+    def stat(file):
+        """
+        Returns:
+            tuple: (st_mtime_ns, st_size), or None if file not exists.
+        """
+        try:
+            stat = os.stat(file)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def read(file):
+        """
+        Returns:
+            bytes: File content, or None if file not exists.
+        """
+        if not os.path.exists(file):
+            return None
+        lock = FileLock(f"{file}.lock")
+        with lock:
+            print(f'read: {file}')
+            with open(file, mode='rb') as f:
+                return f.read()
+
+    def get(self, file, updater, is_template=False):
+        """
+        Read and update a config file, with cache.
+
+        Args:
+            file (str): ./config/{file}.json
+            updater (ConfigUpdater):
+            is_template (bool):
+
+        Returns:
+            dict: A copy of updated config, safe to modify.
+        """
+        key = (file, is_template)
+        with self.lock:
+            entry = self.entries.get(key)
+            stat = self.stat(file)
+            if entry is not None and stat is not None and entry.stat == stat \
+                    and time.time() - stat[0] / 1e9 > self.RACY_SECONDS:
+                self.hit += 1
+                return deepcopy(entry.new)
+
+            content = self.read(file)
+            if content is None:
+                self.entries.pop(key, None)
+                self.miss += 1
+                return updater.config_update(read_file(file), is_template=is_template)
+            digest = hashlib.md5(content).hexdigest()
+            if entry is not None and entry.digest == digest:
+                entry.stat = stat
+                self.hit += 1
+                return deepcopy(entry.new)
+
+            self.miss += 1
+            old = json.loads(content.decode('utf-8'))
+            if entry is not None and not is_template:
+                new = updater.config_update_incremental(entry.old, old, entry.new)
+            else:
+                new = updater.config_update(old, is_template=is_template)
+            self.entries[key] = ConfigCacheEntry(stat=stat, digest=digest, old=old, new=new)
+            return deepcopy(new)
+
+    def clear(self):
+        with self.lock:
+            self.entries = {}
+
+
+CONFIG_CACHE = ConfigCache()
+
+
 class ConfigUpdater:
     # source, target, (optional)convert_func
     redirection = [
@@ -571,6 +688,15 @@ class ConfigUpdater:
     def args(self):
         return read_file(filepath_args())
 
+    @cached_property
+    def args_flat(self):
+        """
+        Returns:
+            dict: Key: Argument path in tuple, such as ('Main', 'Emotion', 'Fleet1Value'),
+                value: Argument data in args.json.
+        """
+        return {tuple(path): data for path, data in deep_iter(self.args, depth=3)}
+
     def config_update(self, old, is_template=False):
         """
         Args:
@@ -581,21 +707,70 @@ class ConfigUpdater:
             dict:
         """
         new = {}
+        for path, data in self.args_flat.items():
+            self._config_load(old, new, keys=path, data=data, is_template=is_template)
+
+        return self._config_update_post(old, new, is_template=is_template)
+
+    def config_update_incremental(self, prev_old, old, prev_new):
+        """
+        Update config from a previous result of config_update(),
+        only arguments changed between `prev_old` and `old` are loaded again.
+
+        Args:
+            prev_old (dict): Previous user config before update.
+            old (dict): User config before update.
+            prev_new (dict): Previous result of config_update(prev_old).
+
+        Returns:
+            dict: The same as config_update(old).
+        """
+        new = deepcopy(prev_new)
+        for path in deep_diff(prev_old, old, depth=3):
+            args = deep_get(self.args, keys=path)
+            if not isinstance(args, dict):
+                # Not an argument
+                continue
+            # Path is shorter if a whole task or group is added or removed
+            for child_path, data in deep_iter(args, depth=3 - len(path)):
+                self._config_load(old, new, keys=path + child_path, data=data, is_template=False)
+
+        return self._config_update_post(old, new, is_template=False)
+
+    def _config_load(self, old, new, keys, data=None, is_template=False):
+        """
+        Load an argument from old config into new config.
 
-        def deep_load(keys):
+        Args:
+            old (dict):
+            new (dict):
+            keys (list[str], tuple[str]): Argument path, such as ('Main', 'Emotion', 'Fleet1Value')
+            data (dict): Argument data in args.json, query from keys if None.
+            is_template (bool):
+        """
+        if data is None:
             data = deep_get(self.args, keys=keys, default={})
-            value = deep_get(old, keys=keys, default=data['value'])
-            typ = data['type']
-            display = data.get('display')
-            if is_template or value is None or value == '' \
-                    or typ in ['lock', 'state'] or (display == 'hide' and typ != 'stored'):
-                value = data['value']
-            value = parse_value(value, data=data)
-            deep_set(new, keys=keys, value=value)
-
-        for path, _ in deep_iter(self.args, depth=3):
-            deep_load(path)
+        value = deep_get(old, keys=keys, default=data['value'])
+        typ = data['type']
+        display = data.get('display')
+        if is_template or value is None or value == '' \
+                or typ in ['lock', 'state'] or (display == 'hide' and typ != 'stored'):
+            value = data['value']
+        value = parse_value(value, data=data)
+        deep_set(new, keys=keys, value=value)
+
+    def _config_update_post(self, old, new, is_template=False):
+        """
+        Fix values that depend on other arguments, after all arguments loaded.
 
+        Args:
+            old (dict):
+            new (dict):
+            is_template (bool):
+
+        Returns:
+            dict:
+        """
         # AzurStatsID
         if is_template:
             deep_set(new, 'Alas.DropRecord.AzurStatsID', None)
@@ -730,8 +905,7 @@ class ConfigUpdater:
         Returns:
             dict:
         """
-        old = read_file(filepath_config(config_name))
-        new = self.config_update(old, is_template=is_template)
+        new = CONFIG_CACHE.get(filepath_config(config_name), updater=self, is_template=is_template)
         # The updated config did not write into file, although it doesn't matters.
         # Commented for performance issue
         # self.write_file(config_name, new)
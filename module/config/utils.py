@@ -3,6 +3,7 @@ import os
 import random
 import string
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
 import yaml
 from filelock import FileLock
@@ -201,6 +202,21 @@ def alas_instance():
     return out
 
 
+@lru_cache(maxsize=8192)
+def key_path(keys):
+    """
+    Split a key path once, key paths in Alas are a limited set of strings
+    and deep_get() / deep_set() are called on them repeatedly.
+
+    Args:
+        keys (str): Such as `Scheduler.NextRun.value`
+
+    Returns:
+        tuple[str]: Such as ('Scheduler', 'NextRun', 'value')
+    """
+    return tuple(keys.split('.'))
+
+
 def deep_get(d, keys, default=None):
     """
     Get values in dictionary safely.
@@ -208,20 +224,22 @@ def deep_get(d, keys, default=None):
 
     Args:
         d (dict):
-        keys (str, list): Such as `Scheduler.NextRun.value`
+        keys (str, list, tuple): Such as `Scheduler.NextRun.value`
         default: Default return if key not found.
 
     Returns:
 
     """
     if isinstance(keys, str):
-        keys = keys.split('.')
-    assert type(keys) is list
+        keys = key_path(keys)
+    assert type(keys) in (list, tuple)
     if d is None:
         return default
-    if not keys:
-        return d
-    return deep_get(d.get(keys[0]), keys[1:], default)
+    for key in keys:
+        d = d.get(key)
+        if d is None:
+            return default
+    return d
 
 
 def deep_set(d, keys, value):
@@ -229,13 +247,20 @@ def deep_set(d, keys, value):
     Set value into dictionary safely, imitating deep_get().
     """
     if isinstance(keys, str):
-        keys = keys.split('.')
-    assert type(keys) is list
+        keys = key_path(keys)
+    assert type(keys) in (list, tuple)
     if not keys:
         return value
     if not isinstance(d, dict):
         d = {}
-    d[keys[0]] = deep_set(d.get(keys[0], {}), keys[1:], value)
+    node = d
+    for key in keys[:-1]:
+        child = node.get(key)
+        if not isinstance(child, dict):
+            child = {}
+            node[key] = child
+        node = child
+    node[keys[-1]] = value
     return d
 
 
@@ -244,8 +269,8 @@ def deep_pop(d, keys, default=None):
     Pop value from dictionary safely, imitating deep_get().
     """
     if isinstance(keys, str):
-        keys = keys.split('.')
-    assert type(keys) is list
+        keys = key_path(keys)
+    assert type(keys) in (list, tuple)
     if not isinstance(d, dict):
         return default
     if not keys:
@@ -261,8 +286,8 @@ def deep_default(d, keys, value):
     Value is set only when the dict doesn't contain such keys.
     """
     if isinstance(keys, str):
-        keys = keys.split('.')
-    assert type(keys) is list
+        keys = key_path(keys)
+    assert type(keys) in (list, tuple)
     if not keys:
         if d:
             return d
@@ -296,6 +321,32 @@ def deep_iter(data, depth=0, current_depth=1):
         yield [], data
 
 
+def deep_diff(d1, d2, depth=0, current_depth=1):
+    """
+    Find key paths where two dictionaries are different.
+    A missing key is considered the same as None, imitating deep_get().
+
+    Args:
+        d1 (dict):
+        d2 (dict):
+        depth (int): Maximum depth to compare, deeper differences are reported at this depth.
+        current_depth (int):
+
+    Yields:
+        list: Key path
+    """
+    if isinstance(d1, dict) and isinstance(d2, dict) \
+            and (depth and current_depth <= depth):
+        for key in list(d1.keys()) + [key for key in d2.keys() if key not in d1]:
+            v1, v2 = d1.get(key), d2.get(key)
+            if v1 == v2:
+                continue
+            for child_path in deep_diff(v1, v2, depth=depth, current_depth=current_depth + 1):
+                yield [key] + child_path
+    elif d1 != d2:
+        yield []
+
+
 def parse_value(value, data):
     """
     Convert a string to float, int, datetime, if possible.
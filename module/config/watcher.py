@@ -1,16 +1,206 @@
+import ctypes
+import ctypes.util
 import os
+import struct
+import sys
+import threading
+import time
 from datetime import datetime
 
-from module.config.utils import filepath_config, DEFAULT_TIME
+from module.config.utils import DEFAULT_TIME, deep_diff, filepath_config
 from module.logger import logger
 
 
+class ConfigMonitor:
+    """
+    Watch config files in a background thread, and wake up the waiting schedulers on modifications.
+
+    Use inotify on Linux, and fallback to polling file stats elsewhere.
+    Files that inotify fails to watch, or all files if inotify thread dies, are polled instead.
+    At most one inotify thread and one polling thread in each process, no matter how many files are watched.
+    """
+    # inotify events
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    EVENT_HEADER = struct.Struct('iIII')
+    # Interval in seconds for polling backend
+    POLL_INTERVAL = 1
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.thread = None
+        self.poll_thread = None
+        self.backend = ''
+        # Key: absolute file path, value: times changed
+        self.version = {}
+        # Key: absolute file path, value: (st_mtime_ns, st_size), files watched by polling
+        self.stat = {}
+        # Watched folders in inotify
+        self.folders = set()
+        self._fd = None
+        self._libc = None
+
+    @staticmethod
+    def get_stat(file):
+        try:
+            stat = os.stat(file)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _inotify_init(self):
+        """
+        Returns:
+            bool: If success.
+        """
+        if not sys.platform.startswith('linux'):
+            return False
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(os.O_CLOEXEC)
+        except (OSError, AttributeError) as e:
+            logger.warning(f'Failed to init inotify: {e}')
+            return False
+        if fd < 0:
+            logger.warning(f'Failed to init inotify, errno={ctypes.get_errno()}')
+            return False
+        self._libc = libc
+        self._fd = fd
+        return True
+
+    def _inotify_add(self, folder):
+        if folder in self.folders:
+            return True
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), mask)
+        if wd < 0:
+            logger.warning(f'Failed to watch {folder}, errno={ctypes.get_errno()}')
+            return False
+        self.folders.add(folder)
+        return True
+
+    def start(self):
+        if self.thread is not None:
+            return
+        if self._inotify_init():
+            self.backend = 'inotify'
+            self.thread = threading.Thread(target=self._inotify_loop, daemon=True)
+        else:
+            self.backend = 'polling'
+            self.thread = threading.Thread(target=self._poll_loop, daemon=True)
+            self.poll_thread = self.thread
+        logger.info(f'Config monitor start, backend: {self.backend}')
+        self.thread.start()
+
+    def _poll(self, file):
+        """
+        Watch a file by polling, must be called with `condition` held.
+        """
+        if file not in self.stat:
+            self.stat[file] = self.get_stat(file)
+        if self.poll_thread is None:
+            self.poll_thread = threading.Thread(target=self._poll_loop, daemon=True)
+            self.poll_thread.start()
+
+    def watch(self, file):
+        """
+        Args:
+            file (str): Config file.
+
+        Returns:
+            int: Current version of file, used in wait().
+        """
+        file = os.path.abspath(file)
+        with self.condition:
+            self.start()
+            if file not in self.version:
+                self.version[file] = 0
+                # Watch limit may be reached with many instances
+                if not (self.backend == 'inotify' and self._inotify_add(os.path.dirname(file))):
+                    self._poll(file)
+            return self.version[file]
+
+    def wait(self, file, version, timeout):
+        """
+        Args:
+            file (str): Config file.
+            version (int): Version from watch() or previous wait().
+            timeout (int, float): Seconds.
+
+        Returns:
+            int: New version if file changed, or None if timeout.
+        """
+        file = os.path.abspath(file)
+        deadline = time.time() + timeout
+        with self.condition:
+            while 1:
+                current = self.version.get(file, 0)
+                if current != version:
+                    return current
+                remain = deadline - time.time()
+                if remain <= 0:
+                    return None
+                self.condition.wait(timeout=remain)
+
+    def _notify(self, file):
+        with self.condition:
+            if file in self.version:
+                self.version[file] += 1
+                self.condition.notify_all()
+
+    def _inotify_loop(self):
+        while 1:
+            try:
+                data = os.read(self._fd, 4096)
+            except OSError as e:
+                logger.warning(f'Config monitor inotify stopped: {e}, fallback to polling')
+                with self.condition:
+                    self.backend = 'polling'
+                    for file in self.version.keys():
+                        self._poll(file)
+                return
+            offset = 0
+            while offset + self.EVENT_HEADER.size <= len(data):
+                wd, mask, cookie, length = self.EVENT_HEADER.unpack_from(data, offset)
+                offset += self.EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                # Event has no folder name, notify all files with the same name
+                for file in list(self.version.keys()):
+                    if os.path.basename(file) == name:
+                        self._notify(file)
+
+    def _poll_loop(self):
+        while 1:
+            time.sleep(self.POLL_INTERVAL)
+            for file in list(self.stat.keys()):
+                stat = self.get_stat(file)
+                if stat != self.stat[file]:
+                    self.stat[file] = stat
+                    self._notify(file)
+
+
+CONFIG_MONITOR = ConfigMonitor()
+
+
 class ConfigWatcher:
+    # Max seconds of each wait in wait_reload(), file stat is checked after each,
+    # so modifications are noticed even if missed by the monitor
+    WAIT_RELOAD_CHECK = 5
     config_name = 'alas'
     start_mtime = DEFAULT_TIME
+    start_stat = None
+    start_version = 0
+    start_data = None
 
     def start_watching(self) -> None:
+        file = filepath_config(self.config_name)
         self.start_mtime = self.get_mtime()
+        self.start_stat = CONFIG_MONITOR.get_stat(file)
+        self.start_version = CONFIG_MONITOR.watch(file)
+        self.start_data = self.read_file(self.config_name)
 
     def get_mtime(self) -> datetime:
         """
@@ -25,9 +215,47 @@ class ConfigWatcher:
         Returns:
             bool: Whether the file has been modified and configs should reload
         """
-        mtime = self.get_mtime()
-        if mtime > self.start_mtime:
-            logger.info(f'Config "{self.config_name}" changed at {mtime}')
+        # Compare in nanoseconds and file size, modifications in the same second won't be missed
+        stat = CONFIG_MONITOR.get_stat(filepath_config(self.config_name))
+        if stat != self.start_stat:
+            logger.info(f'Config "{self.config_name}" changed at {self.get_mtime()}')
             return True
         else:
             return False
+
+    def wait_reload(self, timeout) -> bool:
+        """
+        Block until config file modified or timeout.
+
+        Args:
+            timeout (int, float): Seconds.
+
+        Returns:
+            bool: Whether the file has been modified and configs should reload
+        """
+        file = filepath_config(self.config_name)
+        deadline = time.time() + timeout
+        while 1:
+            remain = deadline - time.time()
+            if remain <= 0:
+                return self.should_reload()
+            version = CONFIG_MONITOR.wait(
+                file, version=self.start_version, timeout=min(remain, self.WAIT_RELOAD_CHECK))
+            if version is None:
+                if self.should_reload():
+                    return True
+                continue
+            self.start_version = version
+            # Events may come from writes before start_watching()
+            if self.should_reload():
+                return True
+
+    def changed_tasks(self) -> list:
+        """
+        Returns:
+            list[str]: Tasks modified since start_watching()
+        """
+        if self.start_data is None:
+            return []
+        data = self.read_file(self.config_name)
+        return [path[0] for path in deep_diff(self.start_data, data, depth=1) if path]
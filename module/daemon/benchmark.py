@@ -232,6 +232,120 @@ class Benchmark(DaemonBase, CampaignUI):
         return method
 
 
+class AutoTune:
+    """
+    Continuous version of Benchmark.
+
+    Time costs of screenshot and control methods in use are recorded by `Device.method_profiler`.
+    Between tasks, screenshot methods are sampled in-situ, and the current one is switched
+    if another method is consistently faster.
+    Control methods are only recorded passively, because sampling them needs clicking during tasks.
+    """
+
+    def __init__(self, config, device):
+        """
+        Args:
+            config (AzurLaneConfig):
+            device (Device):
+        """
+        self.config = config
+        self.device = device
+
+    def get_test_methods(self):
+        """
+        Returns:
+            tuple[str]: Screenshot methods available on current device.
+        """
+        screenshot = ['ADB', 'ADB_nc', 'aScreenCap_nc', 'DroidCast_raw', 'scrcpy']
+
+        def remove(*args):
+            return [l for l in screenshot if l not in args]
+
+        sdk = self.device.sdk_ver
+        if not (21 <= sdk <= 28):
+            screenshot = remove('aScreenCap', 'aScreenCap_nc')
+        if self.device.is_chinac_phone_cloud:
+            screenshot = remove('ADB_nc', 'aScreenCap_nc')
+        return tuple(screenshot)
+
+    def sample(self, method):
+        """
+        Args:
+            method (str): Screenshot method.
+        """
+        profiler = self.device.method_profiler
+        func = self.device.screenshot_methods[method]
+        for _ in range(self.config.BENCHMARK_AUTO_TUNE_SAMPLES):
+            try:
+                # Don't race with screenshot pipeline and controls on the same connection
+                with self.device.device_lock:
+                    profiler.measure('screenshot', method, func)
+            except RequestHumanTakeover:
+                logger.warning(f'Auto tune sampling failed on screenshot method: {method}')
+                break
+            except Exception as e:
+                logger.exception(e)
+                logger.warning(f'Auto tune sampling failed on screenshot method: {method}')
+                break
+
+    def select(self, current):
+        """
+        Args:
+            current (str): Screenshot method in use.
+
+        Returns:
+            str: The method to use.
+        """
+        profiler = self.device.method_profiler
+        record = profiler.get('screenshot', current)
+        current_p50, current_p95 = record.percentile(50), record.percentile(95)
+        margin = self.config.BENCHMARK_AUTO_TUNE_MARGIN
+
+        fastest, fastest_p50 = current, current_p50
+        for method, record in profiler.screenshot.items():
+            if method == current:
+                continue
+            if len(record) < self.config.BENCHMARK_AUTO_TUNE_SAMPLES or record.failure_rate > 0:
+                continue
+            p50, p95 = record.percentile(50), record.percentile(95)
+            if current_p50 is not None:
+                if p50 >= current_p50 * (1 - margin) or p95 >= current_p95:
+                    continue
+            if fastest_p50 is None or p50 < fastest_p50:
+                fastest, fastest_p50 = method, p50
+
+        return fastest
+
+    def run(self):
+        """
+        Returns:
+            str: Screenshot method in use after tuning.
+        """
+        logger.hr('Benchmark auto tune', level=2)
+        current = self.config.Emulator_ScreenshotMethod
+        methods = self.get_test_methods()
+        for method in methods:
+            # Failed methods are retried with reconnecting or restarting in `@retry`, don't sample them again.
+            # Records of methods not in use are only added here, so they are skipped for the rest of the session.
+            if method != current and self.device.method_profiler.get('screenshot', method).failure_rate > 0:
+                logger.info(f'Auto tune skip failed screenshot method: {method}')
+                continue
+            self.sample(method)
+        self.device.method_profiler.show()
+
+        fastest = self.select(current)
+        if fastest != current:
+            logger.info(f'Switch screenshot method: {current} -> {fastest}')
+            self.config.Emulator_ScreenshotMethod = fastest
+            self.device.screenshot_interval_set()
+        else:
+            logger.info(f'Keep screenshot method: {current}')
+        if fastest != 'scrcpy' and 'scrcpy' in methods:
+            # Scrcpy server keeps sending video stream after sampling
+            self.device._scrcpy_server_stop()
+        return fastest
+
+
 def run_benchmark(config):
     try:
         Benchmark(config, task='Benchmark').run()
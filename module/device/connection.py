@@ -4,6 +4,7 @@ import platform
 import re
 import socket
 import subprocess
+import threading
 import time
 from functools import wraps
 
@@ -227,6 +228,15 @@ class Connection(ConnectionAttr):
         """
         return self.adb_shell(['getprop', name]).strip()
 
+    @cached_property
+    def device_lock(self):
+        """
+        Serialize screenshots and controls on the device connection.
+        Screenshot pipeline captures in a background thread while main thread clicks,
+        but adb, uiautomator2 and scrcpy connections are not safe for concurrent use.
+        """
+        return threading.RLock()
+
     @cached_property
     def cpu_abi(self) -> str:
         """
@@ -381,15 +391,16 @@ class Connection(ConnectionAttr):
         logger.error('No `netcat` command available, please use screenshot methods without `_nc` suffix')
         raise RequestHumanTakeover
 
-    def adb_shell_nc(self, cmd, timeout=5, chunk_size=262144):
+    def adb_shell_nc(self, cmd, timeout=5, chunk_size=262144, buffer=None):
         """
         Args:
             cmd (list):
             timeout (int):
             chunk_size (int): Default to 262144
+            buffer (ReceiveBuffer): Receive data into a reusable buffer if provided.
 
         Returns:
-            bytes:
+            bytes, np.ndarray: Bytes, or a view of the buffer if buffer provided.
         """
         # Server start listening
         server = self.reverse_server
@@ -407,7 +418,10 @@ class Connection(ConnectionAttr):
             raise AdbTimeout('reverse server accept timeout')
 
         # Server receive data
-        data = recv_all(conn, chunk_size=chunk_size, recv_interval=0.001)
+        if buffer is not None:
+            data = buffer.recv_all(conn, chunk_size=chunk_size, recv_interval=0.001)
+        else:
+            data = recv_all(conn, chunk_size=chunk_size, recv_interval=0.001)
 
         # Server close connection
         conn.close()
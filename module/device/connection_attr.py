@@ -9,6 +9,7 @@ from module.base.decorator import cached_property
 from module.config.config import AzurLaneConfig
 from module.config.env import IS_ON_PHONE_CLOUD
 from module.config.utils import deep_iter
+from module.device.profiler import MethodProfiler
 from module.exception import RequestHumanTakeover
 from module.logger import logger
 
@@ -292,3 +293,7 @@ class ConnectionAttr:
 
         logger.attr('u2.Device', f'Device(atx_agent_url={device._get_atx_agent_url()})')
         return device
+
+    @cached_property
+    def method_profiler(self) -> MethodProfiler:
+        return MethodProfiler(window=self.config.BENCHMARK_AUTO_TUNE_WINDOW)
@@ -1,3 +1,5 @@
+import time
+
 from module.base.button import Button
 from module.base.decorator import cached_property
 from module.base.timer import Timer
@@ -38,11 +40,11 @@ class Control(Hermit, Minitouch, Scrcpy, MaaTouch):
         logger.info(
             'Click %s @ %s' % (point2str(x, y), button)
         )
-        method = self.click_methods.get(
-            self.config.Emulator_ControlMethod,
-            self.click_adb
-        )
-        method(x, y)
+        name = self.config.Emulator_ControlMethod
+        method = self.click_methods.get(name, self.click_adb)
+        with self.device_lock:
+            self.method_profiler.measure('control', name, method, x, y)
+        self._last_action_time = time.time()
 
     def multi_click(self, button, n, interval=(0.1, 0.2)):
         self.handle_control_check(button)
@@ -70,16 +72,18 @@ class Control(Hermit, Minitouch, Scrcpy, MaaTouch):
             'Click %s @ %s, %s' % (point2str(x, y), button, duration)
         )
         method = self.config.Emulator_ControlMethod
-        if method == 'minitouch':
-            self.long_click_minitouch(x, y, duration)
-        elif method == 'uiautomator2':
-            self.long_click_uiautomator2(x, y, duration)
-        elif method == 'scrcpy':
-            self.long_click_scrcpy(x, y, duration)
-        elif method == 'MaaTouch':
-            self.long_click_maatouch(x, y, duration)
-        else:
-            self.swipe_adb((x, y), (x, y), duration)
+        with self.device_lock:
+            if method == 'minitouch':
+                self.long_click_minitouch(x, y, duration)
+            elif method == 'uiautomator2':
+                self.long_click_uiautomator2(x, y, duration)
+            elif method == 'scrcpy':
+                self.long_click_scrcpy(x, y, duration)
+            elif method == 'MaaTouch':
+                self.long_click_maatouch(x, y, duration)
+            else:
+                self.swipe_adb((x, y), (x, y), duration)
+        self._last_action_time = time.time()
 
     def swipe(self, p1, p2, duration=(0.1, 0.2), name='SWIPE', distance_check=True):
         self.handle_control_check(name)
@@ -106,16 +110,18 @@ class Control(Hermit, Minitouch, Scrcpy, MaaTouch):
                 logger.info('Swipe distance < 10px, dropped')
                 return
 
-        if method == 'minitouch':
-            self.swipe_minitouch(p1, p2)
-        elif method == 'uiautomator2':
-            self.swipe_uiautomator2(p1, p2, duration=duration)
-        elif method == 'scrcpy':
-            self.swipe_scrcpy(p1, p2)
-        elif method == 'MaaTouch':
-            self.swipe_maatouch(p1, p2)
-        else:
-            self.swipe_adb(p1, p2, duration=duration)
+        with self.device_lock:
+            if method == 'minitouch':
+                self.swipe_minitouch(p1, p2)
+            elif method == 'uiautomator2':
+                self.swipe_uiautomator2(p1, p2, duration=duration)
+            elif method == 'scrcpy':
+                self.swipe_scrcpy(p1, p2)
+            elif method == 'MaaTouch':
+                self.swipe_maatouch(p1, p2)
+            else:
+                self.swipe_adb(p1, p2, duration=duration)
+        self._last_action_time = time.time()
 
     def swipe_vector(self, vector, box=(123, 159, 1175, 628), random_range=(0, 0, 0, 0), padding=15,
                      duration=(0.1, 0.2), whitelist_area=None, blacklist_area=None, name='SWIPE', distance_check=True):
@@ -153,18 +159,20 @@ class Control(Hermit, Minitouch, Scrcpy, MaaTouch):
             'Drag %s -> %s' % (point2str(*p1), point2str(*p2))
         )
         method = self.config.Emulator_ControlMethod
-        if method == 'minitouch':
-            self.drag_minitouch(p1, p2, point_random=point_random)
-        elif method == 'uiautomator2':
-            self.drag_uiautomator2(
-                p1, p2, segments=segments, shake=shake, point_random=point_random, shake_random=shake_random,
-                swipe_duration=swipe_duration, shake_duration=shake_duration)
-        elif method == 'scrcpy':
-            self.drag_scrcpy(p1, p2, point_random=point_random)
-        elif method == 'MaaTouch':
-            self.drag_maatouch(p1, p2, point_random=point_random)
-        else:
-            logger.warning(f'Control method {method} does not support drag well, '
-                           f'falling back to ADB swipe may cause unexpected behaviour')
-            self.swipe_adb(p1, p2, duration=ensure_time(swipe_duration * 2))
-            self.click(Button(area=(), color=(), button=area_offset(point_random, p2), name=name ),False)
+        with self.device_lock:
+            if method == 'minitouch':
+                self.drag_minitouch(p1, p2, point_random=point_random)
+            elif method == 'uiautomator2':
+                self.drag_uiautomator2(
+                    p1, p2, segments=segments, shake=shake, point_random=point_random, shake_random=shake_random,
+                    swipe_duration=swipe_duration, shake_duration=shake_duration)
+            elif method == 'scrcpy':
+                self.drag_scrcpy(p1, p2, point_random=point_random)
+            elif method == 'MaaTouch':
+                self.drag_maatouch(p1, p2, point_random=point_random)
+            else:
+                logger.warning(f'Control method {method} does not support drag well, '
+                               f'falling back to ADB swipe may cause unexpected behaviour')
+                self.swipe_adb(p1, p2, duration=ensure_time(swipe_duration * 2))
+                self.click(Button(area=(), color=(), button=area_offset(point_random, p2), name=name ),False)
+        self._last_action_time = time.time()
@@ -139,6 +139,9 @@ class Device(Screenshot, Control, AppControl, EmulatorManager):
         return self.image
 
     def release_during_wait(self):
+        # Background capture is still running,
+        # stop it during wait
+        self.screenshot_pipeline_stop()
         # Scrcpy server is still sending video stream,
         # stop it during wait
         if self.config.Emulator_ScreenshotMethod == 'scrcpy':
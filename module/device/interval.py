@@ -0,0 +1,80 @@
+import cv2
+import numpy as np
+
+from module.base.utils import rgb2luma
+
+
+class AdaptiveInterval:
+    """
+    Adjust screenshot interval by how much the screen changes between frames.
+
+    When screen is static (loading, auto battle), interval backs off towards `maximum`,
+    saving ADB bandwidth and host CPU.
+    When screen changes or after a click, interval returns to `minimum` immediately.
+    """
+    # Size of the downsampled luma image to compare frames
+    SIGNATURE_SIZE = (64, 36)
+
+    def __init__(self, minimum=0.1, maximum=0.6, threshold=1.0, backoff=1.5):
+        """
+        Args:
+            minimum (int, float): Minimum interval in seconds.
+            maximum (int, float): Maximum interval in seconds.
+            threshold (float): 0 to 255, mean luma difference lower than this is considered static.
+            backoff (float): Multiply interval by this on each static frame.
+        """
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.threshold = threshold
+        self.backoff = backoff
+        self.interval = minimum
+        self.prev = None
+
+    def set_limit(self, minimum, maximum):
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.interval = minimum
+
+    def signature(self, image):
+        """
+        Args:
+            image (np.ndarray): Screenshot.
+
+        Returns:
+            np.ndarray: Downsampled luma image, dtype int16.
+        """
+        image = cv2.resize(image, self.SIGNATURE_SIZE, interpolation=cv2.INTER_AREA)
+        if len(image.shape) == 3:
+            image = rgb2luma(image)
+        return image.astype(np.int16)
+
+    def difference(self, image):
+        """
+        Args:
+            image (np.ndarray): Screenshot.
+
+        Returns:
+            float: Mean luma difference from previous frame, 255 if no previous frame.
+        """
+        signature = self.signature(image)
+        prev, self.prev = self.prev, signature
+        if prev is None or prev.shape != signature.shape:
+            return 255.
+        return float(np.mean(np.abs(signature - prev)))
+
+    def reset(self):
+        self.interval = self.minimum
+
+    def update(self, image):
+        """
+        Args:
+            image (np.ndarray): New screenshot.
+
+        Returns:
+            float: Interval before next screenshot.
+        """
+        if self.difference(image) < self.threshold:
+            self.interval = min(self.interval * self.backoff, self.maximum)
+        else:
+            self.interval = self.minimum
+        return self.interval
@@ -7,10 +7,10 @@ import time
 from adbutils.errors import AdbError
 from lxml import etree
 
-from module.base.decorator import Config
+from module.base.decorator import Config, cached_property
 from module.device.connection import Connection
-from module.device.method.utils import (RETRY_TRIES, retry_sleep, remove_prefix, handle_adb_error,
-                                        ImageTruncated, PackageNotInstalled)
+from module.device.method.utils import (RETRY_TRIES, retry_sleep, handle_adb_error,
+                                        ImageTruncated, PackageNotInstalled, ReceiveBuffer)
 from module.exception import RequestHumanTakeover, ScriptError
 from module.logger import logger
 
@@ -70,10 +70,11 @@ def retry(func):
     return retry_wrapper
 
 
-def load_screencap(data):
+def load_screencap(data, out=None):
     """
     Args:
-        data: Raw data from `screencap`
+        data (bytes, np.ndarray): Raw data from `screencap`
+        out (np.ndarray): Array to write the decoded image into, to avoid allocating a new one.
 
     Returns:
         np.ndarray:
@@ -93,7 +94,7 @@ def load_screencap(data):
         # ValueError: cannot reshape array of size 0 into shape (720,1280,4)
         raise ImageTruncated(str(e))
 
-    image = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+    image = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR, dst=out)
     if image is None:
         raise ImageTruncated('Empty image after cv2.cvtColor')
 
@@ -103,26 +104,45 @@ def load_screencap(data):
 class Adb(Connection):
     __screenshot_method = [0, 1, 2]
     __screenshot_method_fixed = [0, 1, 2]
+    # Output array of the last decoded screenshot, reused if SCREENSHOT_REUSE_BUFFER
+    _screencap_out = None
 
-    @staticmethod
-    def __load_screenshot(screenshot, method):
+    @cached_property
+    def _screencap_buffer(self):
+        return ReceiveBuffer()
+
+    @cached_property
+    def _screencap_fix_buffer(self):
+        # Line endings fixed by `__load_screenshot()`
+        return ReceiveBuffer()
+
+    @property
+    def screenshot_reuse_buffer(self):
+        """
+        Screenshot output arrays can't be reused when they're produced in background thread.
+        """
+        return self.config.SCREENSHOT_REUSE_BUFFER and not self.config.SCREENSHOT_PIPELINE
+
+    def __load_screenshot(self, screenshot, method):
+        # Line endings are replaced into a reusable buffer instead of `bytes.replace()` copies
         if method == 0:
-            pass
+            image = np.frombuffer(screenshot, np.uint8)
         elif method == 1:
-            screenshot = screenshot.replace(b'\r\n', b'\n')
+            image = self._screencap_fix_buffer.remove_cr(screenshot, cr=1)
         elif method == 2:
-            screenshot = screenshot.replace(b'\r\r\n', b'\n')
+            image = self._screencap_fix_buffer.remove_cr(screenshot, cr=2)
         else:
             raise ScriptError(f'Unknown method to load screenshots: {method}')
 
         # fix compatibility issues for adb screencap decode problem when the data is from vmos pro
         # When use adb screencap for a screenshot from vmos pro, there would be a header more than that from emulator
         # which would cause image decode problem. So i check and remove the header there.
-        screenshot = remove_prefix(screenshot, b'long long=8 fun*=10\n')
-
-        image = np.frombuffer(screenshot, np.uint8)
+        prefix = np.frombuffer(b'long long=8 fun*=10\n', np.uint8)
         if image is None:
             raise ImageTruncated('Empty image after reading from buffer')
+        if image.size >= prefix.size and np.array_equal(image[:prefix.size], prefix):
+            # Slice the array view instead of the bytes to avoid copying
+            image = image[prefix.size:]
 
         image = cv2.imdecode(image, cv2.IMREAD_COLOR)
         if image is None:
@@ -168,11 +188,16 @@ class Adb(Connection):
 
     @retry
     def screenshot_adb_nc(self):
-        data = self.adb_shell_nc(['screencap'])
+        data = self.adb_shell_nc(['screencap'], buffer=self._screencap_buffer)
         if len(data) < 500:
-            logger.warning(f'Unexpected screenshot: {data}')
+            logger.warning(f'Unexpected screenshot: {data.tobytes()}')
 
-        return load_screencap(data)
+        if self.screenshot_reuse_buffer:
+            image = load_screencap(data, out=self._screencap_out)
+            self._screencap_out = image
+        else:
+            image = load_screencap(data)
+        return image
 
     @retry
     def click_adb(self, x, y):
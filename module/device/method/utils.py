@@ -4,6 +4,7 @@ import socket
 import time
 import typing as t
 
+import numpy as np
 import uiautomator2 as u2
 from adbutils import AdbTimeout
 from lxml import etree
@@ -107,6 +108,118 @@ def recv_all(stream, chunk_size=4096, recv_interval=0.000) -> bytes:
         raise AdbTimeout('adb read timeout')
 
 
+class ReceiveBuffer:
+    """
+    A reusable buffer to receive screenshot data.
+    Data is received into a preallocated array with `recv_into`,
+    instead of joining bytes fragments into a new bytes object on every frame.
+    """
+
+    def __init__(self, size=0):
+        self.buffer = np.empty(size, dtype=np.uint8)
+        # Bool mask for remove_cr()
+        self.mask = np.empty(size, dtype=bool)
+
+    def ensure(self, size):
+        """
+        Enlarge buffer if it's smaller than `size`, received data is preserved.
+        """
+        if self.buffer.size < size:
+            buffer = np.empty(max(size, self.buffer.size * 2), dtype=np.uint8)
+            buffer[:self.buffer.size] = self.buffer
+            self.buffer = buffer
+
+    def recv_all(self, stream, chunk_size=262144, recv_interval=0.000):
+        """
+        The same as `recv_all()` but data is received into the buffer.
+
+        Args:
+            stream:
+            chunk_size:
+            recv_interval (float): Default to 0.000, use 0.001 if receiving as server
+
+        Returns:
+            np.ndarray: A view of received data, valid until next receiving.
+
+        Raises:
+            AdbTimeout
+        """
+        if isinstance(stream, AdbConnection):
+            stream = stream.conn
+        stream.settimeout(10)
+
+        size = 0
+        try:
+            while 1:
+                self.ensure(size + chunk_size)
+                received = stream.recv_into(self.buffer[size:size + chunk_size])
+                if received:
+                    size += received
+                    time.sleep(recv_interval)
+                else:
+                    break
+        except socket.timeout:
+            raise AdbTimeout('adb read timeout')
+        return self.buffer[:size]
+
+    def remove_cr(self, data, cr=1):
+        """
+        Same as `data.replace(b'\\r' * cr + b'\\n', b'\\n')`, but written into the buffer,
+        so no new bytes object is allocated on every frame.
+
+        Args:
+            data (bytes): Data not in this buffer.
+            cr (int): Amount of '\\r' before '\\n' to remove, 1 or 2.
+
+        Returns:
+            np.ndarray: A view of fixed data, valid until next call.
+        """
+        src = np.frombuffer(data, dtype=np.uint8)
+        size = src.size
+        if self.mask.size < size:
+            self.mask = np.empty(max(size, self.mask.size * 2), dtype=bool)
+        if size <= cr:
+            self.ensure(size)
+            self.buffer[:size] = src
+            return self.buffer[:size]
+
+        # Index of LF which has `cr` CR before it
+        lf = self.mask[:size - cr]
+        np.equal(src[cr:], 10, out=lf)
+        lf = np.flatnonzero(lf) + cr
+        for offset in range(1, cr + 1):
+            lf = lf[src[lf - offset] == 13]
+
+        keep = self.mask[:size]
+        keep.fill(True)
+        for offset in range(1, cr + 1):
+            keep[lf - offset] = False
+        size -= lf.size * cr
+        self.ensure(size)
+        return np.compress(keep, src, out=self.buffer[:size])
+
+    def read_all(self, fp, chunk_size=262144):
+        """
+        Read a file-like object, such as `requests.Response.raw`, into the buffer.
+
+        Args:
+            fp: Object that has `readinto()`
+            chunk_size:
+
+        Returns:
+            np.ndarray: A view of received data, valid until next receiving.
+        """
+        size = 0
+        while 1:
+            self.ensure(size + chunk_size)
+            received = fp.readinto(memoryview(self.buffer[size:size + chunk_size]))
+            if received:
+                size += received
+            else:
+                break
+        return self.buffer[:size]
+
+
 def possible_reasons(*args):
     """
     Show possible reasons
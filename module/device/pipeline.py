@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import deque
+
+from module.exception import RequestHumanTakeover
+from module.logger import logger
+
+
+class ScreenshotPipeline:
+    """
+    Capture screenshots continuously in a background thread,
+    so device round-trip and decoding are no longer on the critical path of main thread.
+
+    Frames are kept in a small ring buffer with their capture time,
+    `get()` returns the freshest frame which started capturing after a given time,
+    and never returns the same frame twice, so confirmations counted across screenshots are real.
+
+    Captures are paced to `interval`, a waiting `get()` wakes up the capture loop immediately.
+
+    Each capture holds `lock`, controls on the same device connection should hold it too,
+    see Connection.device_lock.
+    """
+
+    def __init__(self, capture, buffer=3, lock=None, interval=None):
+        """
+        Args:
+            capture (callable): Function that takes a screenshot and returns np.ndarray.
+            buffer (int): Amount of frames to keep.
+            lock (threading.RLock): Lock shared with controls.
+            interval (callable): Function that returns min seconds between captures, None for no pacing.
+        """
+        self.capture = capture
+        self.lock = lock if lock is not None else threading.RLock()
+        self.interval = interval
+        # Element: (capture start time, np.ndarray)
+        self.frames = deque(maxlen=max(buffer, 1))
+        self.condition = threading.Condition()
+        self.thread = None
+        self.alive = False
+        self.error = None
+        # Capture start time of the last frame returned by get()
+        self.last = 0.
+        # Amount of get() waiting for a new frame, and the newest `after` they require
+        self.waiting = 0
+        self.want = 0.
+
+    def is_running(self):
+        return self.alive and self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        logger.info('Screenshot pipeline start')
+        self.alive = True
+        self.error = None
+        self.frames.clear()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.thread is None:
+            return
+        logger.info('Screenshot pipeline stop')
+        self.alive = False
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread is not threading.current_thread():
+            self.thread.join(timeout=10)
+        self.thread = None
+        self.frames.clear()
+
+    def _loop(self):
+        while self.alive:
+            start = time.time()
+            try:
+                with self.lock:
+                    image = self.capture()
+            except Exception as e:
+                # Errors are re-raised in main thread
+                with self.condition:
+                    self.error = e
+                    self.alive = False
+                    self.condition.notify_all()
+                return
+            with self.condition:
+                self.frames.append((start, image))
+                self.condition.notify_all()
+                if self.interval is not None:
+                    deadline = start + self.interval()
+                    while self.alive and not (self.waiting and start <= self.want):
+                        remain = deadline - time.time()
+                        if remain <= 0:
+                            break
+                        self.condition.wait(timeout=remain)
+
+    def get(self, after=0., timeout=10):
+        """
+        Args:
+            after (float): Timestamp, frames captured before this will be dropped.
+                Usually to be the time of last click or swipe.
+                Frames not newer than the last returned one are dropped as well.
+            timeout (int, float): Seconds to wait for a new frame.
+
+        Returns:
+            np.ndarray: The freshest frame, never the same as previous call.
+
+        Raises:
+            Exception: Errors from screenshot method.
+            RequestHumanTakeover: If no frame received in `timeout`.
+        """
+        if not self.is_running() and self.error is None:
+            self.start()
+        deadline = time.time() + timeout
+        after = max(after, self.last)
+        with self.condition:
+            while 1:
+                if self.error is not None:
+                    error, self.error = self.error, None
+                    raise error
+                if self.frames:
+                    frame_time, image = self.frames[-1]
+                    if frame_time > after:
+                        self.last = frame_time
+                        return image
+                remain = deadline - time.time()
+                if remain <= 0:
+                    break
+                # Wake up capture loop if it's pacing
+                self.waiting += 1
+                self.want = max(self.want, after)
+                self.condition.notify_all()
+                try:
+                    self.condition.wait(timeout=remain)
+                finally:
+                    self.waiting -= 1
+
+        logger.critical(f'Screenshot pipeline did not receive a new frame in {timeout}s')
+        self.stop()
+        raise RequestHumanTakeover
@@ -0,0 +1,117 @@
+import time
+from collections import deque
+
+import numpy as np
+
+from module.base.utils import float2str
+from module.logger import logger
+
+
+class LatencyRecord:
+    """
+    Rolling window of time costs of a screenshot or control method.
+    """
+
+    def __init__(self, window=100):
+        # Element: float for time cost, None for failure
+        self.record = deque(maxlen=window)
+
+    def add(self, cost):
+        """
+        Args:
+            cost (float, None): Time cost in seconds, None if failed.
+        """
+        self.record.append(cost)
+
+    def __len__(self):
+        return len(self.record)
+
+    @property
+    def costs(self):
+        """
+        Returns:
+            np.ndarray: Time costs of successful calls.
+        """
+        return np.array([cost for cost in self.record if cost is not None], dtype=float)
+
+    @property
+    def failure_rate(self):
+        if not self.record:
+            return 0.
+        return sum(1 for cost in self.record if cost is None) / len(self.record)
+
+    def percentile(self, q):
+        """
+        Args:
+            q (int, float): 0 to 100.
+
+        Returns:
+            float: Time cost, or None if no successful calls.
+        """
+        costs = self.costs
+        if not costs.size:
+            return None
+        return float(np.percentile(costs, q))
+
+    def __str__(self):
+        def to_str(cost):
+            return 'None' if cost is None else f'{float2str(cost)}s'
+
+        return f'p50={to_str(self.percentile(50))}, p95={to_str(self.percentile(95))}, ' \
+               f'p99={to_str(self.percentile(99))}, failure={float2str(self.failure_rate)}, samples={len(self)}'
+
+
+class MethodProfiler:
+    """
+    Record latency of screenshot and control methods in use,
+    so that slowing down of emulators can be noticed, see AutoTune in module.daemon.benchmark.
+    """
+
+    def __init__(self, window=100):
+        self.window = window
+        # Key: method name, value: LatencyRecord
+        self.screenshot = {}
+        self.control = {}
+
+    def get(self, genre, method):
+        """
+        Args:
+            genre (str): 'screenshot' or 'control'
+            method (str): Method name, such as 'ADB_nc'
+
+        Returns:
+            LatencyRecord:
+        """
+        records = self.__getattribute__(genre)
+        if method not in records:
+            records[method] = LatencyRecord(window=self.window)
+        return records[method]
+
+    def add(self, genre, method, cost):
+        self.get(genre, method).add(cost)
+
+    def measure(self, genre, method, func, *args, **kwargs):
+        """
+        Call a method and record its time cost.
+
+        Args:
+            genre (str): 'screenshot' or 'control'
+            method (str): Method name
+            func: Function to call.
+
+        Returns:
+            Result of func.
+        """
+        start = time.time()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.add(genre, method, None)
+            raise
+        self.add(genre, method, time.time() - start)
+        return result
+
+    def show(self):
+        for genre in ['screenshot', 'control']:
+            for method, record in self.__getattribute__(genre).items():
+                logger.attr(f'{genre.capitalize()} {method}', str(record))
@@ -8,13 +8,16 @@ import numpy as np
 from PIL import Image
 
 from module.base.decorator import cached_property
+from module.base.frame_cache import FRAME_CACHE
 from module.base.timer import Timer
 from module.base.utils import get_color, image_size, limit_in, save_image
 from module.device.method.adb import Adb
 from module.device.method.ascreencap import AScreenCap
 from module.device.method.droidcast import DroidCast
 from module.device.method.scrcpy import Scrcpy
+from module.device.interval import AdaptiveInterval
 from module.device.method.wsa import WSA
+from module.device.pipeline import ScreenshotPipeline
 from module.exception import RequestHumanTakeover, ScriptError
 from module.logger import logger
 
@@ -25,6 +28,8 @@ class Screenshot(Adb, WSA, DroidCast, AScreenCap, Scrcpy):
     _minicap_uninstalled = False
     _screenshot_interval = Timer(0.1)
     _last_save_time = {}
+    # Timestamp of the last click or swipe
+    _last_action_time = 0.
     image: np.ndarray
 
     @cached_property
@@ -45,31 +50,87 @@ class Screenshot(Adb, WSA, DroidCast, AScreenCap, Scrcpy):
         Returns:
             np.ndarray:
         """
+        if self.config.SCREENSHOT_ADAPTIVE_INTERVAL:
+            self._screenshot_interval_action_reset()
         self._screenshot_interval.wait()
         self._screenshot_interval.reset()
 
         for _ in range(2):
-            method = self.screenshot_methods.get(
-                self.config.Emulator_ScreenshotMethod,
-                self.screenshot_adb
-            )
-            self.image = method()
-
-            if self.config.Emulator_ScreenshotDedithering:
-                # This will take 40-60ms
-                cv2.fastNlMeansDenoising(self.image, self.image, h=17, templateWindowSize=1, searchWindowSize=2)
+            if self.config.SCREENSHOT_PIPELINE:
+                self.image = self.screenshot_pipeline.get(after=self._last_action_time)
+            else:
+                self.image = self._screenshot_capture()
             self.image = self._handle_orientated_image(self.image)
 
             if self.config.Error_SaveError:
-                self.screenshot_deque.append({'time': datetime.now(), 'image': self.image})
+                # Output arrays are overwritten by the next screenshot if reusing buffers
+                image = self.image.copy() if self.screenshot_reuse_buffer else self.image
+                self.screenshot_deque.append({'time': datetime.now(), 'image': image})
 
             if self.check_screen_size() and self.check_screen_black():
                 break
             else:
                 continue
 
+        if self.config.SCREENSHOT_ADAPTIVE_INTERVAL:
+            self._screenshot_interval_adapt()
+        FRAME_CACHE.set_frame(self.image)
         return self.image
 
+    @cached_property
+    def screenshot_adaptive_interval(self):
+        return AdaptiveInterval(
+            minimum=self._screenshot_interval.limit,
+            maximum=self._screenshot_interval.limit,
+            threshold=self.config.SCREENSHOT_ADAPTIVE_THRESHOLD,
+        )
+
+    def _screenshot_interval_adapt(self):
+        """
+        Back off screenshot interval when screen is static, see AdaptiveInterval.
+        """
+        self._screenshot_interval.limit = self.screenshot_adaptive_interval.update(self.image)
+
+    def _screenshot_interval_action_reset(self):
+        """
+        Screen is going to change after click or swipe, don't wait the backed-off interval.
+        Called before waiting, `_screenshot_interval` was reset at the previous screenshot.
+        """
+        if self._last_action_time > self._screenshot_interval._current:
+            adaptive = self.screenshot_adaptive_interval
+            adaptive.reset()
+            self._screenshot_interval.limit = adaptive.minimum
+
+    def _screenshot_capture(self):
+        """
+        Take a screenshot with the screenshot method in config.
+
+        Returns:
+            np.ndarray:
+        """
+        name = self.config.Emulator_ScreenshotMethod
+        method = self.screenshot_methods.get(name, self.screenshot_adb)
+        image = self.method_profiler.measure('screenshot', name, method)
+
+        if self.config.Emulator_ScreenshotDedithering:
+            # This will take 40-60ms
+            cv2.fastNlMeansDenoising(image, image, h=17, templateWindowSize=1, searchWindowSize=2)
+        return image
+
+    @cached_property
+    def screenshot_pipeline(self):
+        """
+        Capture screenshots in background, enabled by SCREENSHOT_PIPELINE.
+        Per-loop latency becomes max(capture, processing) instead of their sum.
+        """
+        return ScreenshotPipeline(
+            self._screenshot_capture, buffer=self.config.SCREENSHOT_PIPELINE_BUFFER, lock=self.device_lock,
+            interval=lambda: self._screenshot_interval.limit)
+
+    def screenshot_pipeline_stop(self):
+        if 'screenshot_pipeline' in self.__dict__:
+            self.screenshot_pipeline.stop()
+
     def _handle_orientated_image(self, image):
         """
         Args:
@@ -149,13 +210,16 @@ class Screenshot(Adb, WSA, DroidCast, AScreenCap, Scrcpy):
                 Minimum interval between 2 screenshots in seconds.
                 Or None for Optimization_ScreenshotInterval, 'combat' for Optimization_CombatScreenshotInterval
         """
+        maximum = None
         if interval is None:
+            maximum = self.config.SCREENSHOT_ADAPTIVE_MAXIMUM.get('default')
             origin = self.config.Optimization_ScreenshotInterval
             interval = limit_in(origin, 0.1, 0.3)
             if interval != origin:
                 logger.warning(f'Optimization.ScreenshotInterval {origin} is revised to {interval}')
                 self.config.Optimization_ScreenshotInterval = interval
         elif interval == 'combat':
+            maximum = self.config.SCREENSHOT_ADAPTIVE_MAXIMUM.get('combat')
             origin = self.config.Optimization_CombatScreenshotInterval
             interval = limit_in(origin, 0.3, 1.0)
             if interval != origin:
@@ -172,7 +236,15 @@ class Screenshot(Adb, WSA, DroidCast, AScreenCap, Scrcpy):
         if self.config.Emulator_ScreenshotMethod == 'scrcpy':
             interval = 0.1
 
-        if interval != self._screenshot_interval.limit:
+        if self.config.SCREENSHOT_ADAPTIVE_INTERVAL:
+            # Interval backs off from `interval` to `maximum` when screen is static
+            maximum = interval if maximum is None else max(interval, maximum)
+            adaptive = self.screenshot_adaptive_interval
+            if interval != adaptive.minimum or maximum != adaptive.maximum:
+                logger.info(f'Screenshot interval set to {interval}s ~ {maximum}s')
+                adaptive.set_limit(interval, maximum)
+                self._screenshot_interval.limit = interval
+        elif interval != self._screenshot_interval.limit:
             logger.info(f'Screenshot interval set to {interval}s')
             self._screenshot_interval.limit = interval
 
@@ -1,7 +1,11 @@
 import datetime
+import gzip
 import logging
 import os
+import queue
+import shutil
 import sys
+import threading
 from typing import Callable, List
 
 from rich.console import Console, ConsoleOptions, ConsoleRenderable, NewLine
@@ -26,11 +30,6 @@ logging.raiseExceptions = True  # Set True if wanna see encode errors on console
 RichHandler.KEYWORDS = []
 
 
-class RichFileHandler(RichHandler):
-    # Rename
-    pass
-
-
 class RichRenderableHandler(RichHandler):
     """
     Pass renderable into a function
@@ -40,7 +39,12 @@ class RichRenderableHandler(RichHandler):
         super().__init__(*args, **kwargs)
         self._func = func
 
-    def emit(self, record: logging.LogRecord) -> None:
+    def prepare(self, record: logging.LogRecord):
+        """
+        Returns:
+            str: Formatted message.
+            Traceback: Or None if record has no exception.
+        """
         message = self.format(record)
         traceback = None
         if (
@@ -72,6 +76,10 @@ class RichRenderableHandler(RichHandler):
                         record, formatter.datefmt)
                 message = formatter.formatMessage(record)
 
+        return message, traceback
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message, traceback = self.prepare(record)
         message_renderable = self.render_message(record, message)
         log_renderable = self.render(
             record=record, traceback=traceback, message_renderable=message_renderable
@@ -80,12 +88,191 @@ class RichRenderableHandler(RichHandler):
         # Directly put renderable into function
         self._func(log_renderable)
 
+    def render_record(self, data: dict) -> ConsoleRenderable:
+        """
+        Render a plain record from StructuredLogHandler.
+        """
+        record = logging.makeLogRecord(data)
+        message_renderable = self.render_message(record, data['message'])
+        return self.render(
+            record=record, traceback=data.get('traceback'), message_renderable=message_renderable
+        )
+
     def handle(self, record: logging.LogRecord) -> bool:
         if not self._func:
             return True
         super().handle(record)
 
 
+class StructuredLogHandler(RichRenderableHandler):
+    """
+    Pass plain records into a function, and leave rendering to the receiver, see render_record().
+    Records are dicts of builtin types, which are much cheaper to pickle than renderables.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message, traceback = self.prepare(record)
+        self._func({
+            'name': record.name,
+            'levelname': record.levelname,
+            'levelno': record.levelno,
+            'created': record.created,
+            'markup': getattr(record, 'markup', None),
+            'message': message,
+            'traceback': traceback,
+        })
+
+
+class RichFileHandler(RichHandler):
+    """
+    Write logs to file in a background thread, so the caller never waits for disk I/O.
+
+    Records are formatted on the caller thread, rich tracebacks are extracted there as well
+    since frames and locals won't live long. The writer thread renders and writes them in batches,
+    and flushes the file once a batch.
+
+    Log file is `./log/<date>_<name>.txt`, a new one is opened at midnight.
+    If `max_bytes` is set, full files are rotated to `./log/<date>_<name>.<index>.txt`.
+    If `compress` is set, rotated files and files of previous days are gzip compressed.
+    """
+    # Max records to write before a flush
+    BATCH = 200
+
+    def __init__(self, *args, log_name, max_bytes=0, compress=False, **kwargs):
+        """
+        Args:
+            log_name (str): Such as `alas`.
+            max_bytes (int): Rotate log file if it exceeds this size, 0 to disable.
+            compress (bool): Whether to gzip rotated log files.
+        """
+        self.log_name = log_name
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.date = datetime.date.today()
+        self.log_file = self.get_log_file(self.date)
+        console = Console(
+            file=self.open(self.log_file),
+            no_color=True,
+            highlight=False,
+            width=119,
+        )
+        super().__init__(*args, console=console, **kwargs)
+        # Element: (record, message, traceback) or (None, objects, None) from print()
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._loop, name='RichFileHandler', daemon=True)
+        self.thread.start()
+
+    # Same as RichRenderableHandler
+    prepare = RichRenderableHandler.prepare
+
+    def get_log_file(self, date, index=0):
+        if index:
+            return f'./log/{date}_{self.log_name}.{index}.txt'
+        else:
+            return f'./log/{date}_{self.log_name}.txt'
+
+    @staticmethod
+    def open(file):
+        try:
+            return open(file, mode='a', encoding='utf-8')
+        except FileNotFoundError:
+            os.mkdir('./log')
+            return open(file, mode='a', encoding='utf-8')
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message, traceback = self.prepare(record)
+        self.queue.put((record, message, traceback))
+
+    def print(self, *objects) -> None:
+        self.queue.put((None, objects, None))
+
+    def flush(self) -> None:
+        """
+        Block until all queued logs are written.
+        """
+        if self.thread.is_alive() and threading.current_thread() is not self.thread:
+            self.queue.join()
+
+    def close(self) -> None:
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join(timeout=5)
+        self.console.file.close()
+        super().close()
+
+    def _write(self, item):
+        record, message, traceback = item
+        if record is None:
+            self.console.print(*message)
+        else:
+            message_renderable = self.render_message(record, message)
+            log_renderable = self.render(
+                record=record, traceback=traceback, message_renderable=message_renderable
+            )
+            self.console.print(log_renderable)
+
+    def _compress(self, file):
+        try:
+            with open(file, 'rb') as f_in, gzip.open(f'{file}.gz', 'wb') as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            os.remove(file)
+        except OSError:
+            # Just leave the uncompressed one
+            pass
+
+    def _rotate(self):
+        date = datetime.date.today()
+        if date != self.date:
+            log_file = self.get_log_file(date)
+            file = self.open(log_file)
+            self.console.file.close()
+            if self.compress:
+                self._compress(self.log_file)
+            self.console.file = file
+            self.date = date
+            self.log_file = log_file
+            logger.log_file = log_file
+        elif self.max_bytes and self.console.file.tell() >= self.max_bytes:
+            index = 1
+            while os.path.exists(self.get_log_file(date, index)) \
+                    or os.path.exists(f'{self.get_log_file(date, index)}.gz'):
+                index += 1
+            rotated = self.get_log_file(date, index)
+            self.console.file.close()
+            os.replace(self.log_file, rotated)
+            self.console.file = self.open(self.log_file)
+            if self.compress:
+                self._compress(rotated)
+
+    def _loop(self):
+        while 1:
+            items = [self.queue.get()]
+            try:
+                while len(items) < self.BATCH:
+                    items.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            try:
+                try:
+                    self._rotate()
+                except OSError as e:
+                    # Keep writing to the current file
+                    sys.stderr.write(f'Failed to rotate log file: {e}\n')
+                for item in items:
+                    if item is None:
+                        self.console.file.flush()
+                        return
+                    try:
+                        self._write(item)
+                    except Exception:
+                        self.handleError(item[0] or logging.makeLogRecord({'msg': item[1]}))
+                self.console.file.flush()
+            finally:
+                for _ in items:
+                    self.queue.task_done()
+
+
 class HTMLConsole(Console):
     """
     Force full feature console
@@ -185,25 +372,20 @@ def _set_file_logger(name=pyw_name):
     logger.log_file = log_file
 
 
-def set_file_logger(name=pyw_name):
+def set_file_logger(name=pyw_name, max_bytes=0, compress=False):
+    """
+    Args:
+        name (str): Log name.
+        max_bytes (int): Rotate log file if it exceeds this size, 0 to disable.
+        compress (bool): Whether to gzip rotated log files.
+    """
     if '_' in name:
         name = name.split('_', 1)[0]
-    log_file = f'./log/{datetime.date.today()}_{name}.txt'
-    try:
-        file = open(log_file, mode='a', encoding='utf-8')
-    except FileNotFoundError:
-        os.mkdir('./log')
-        file = open(log_file, mode='a', encoding='utf-8')
-
-    file_console = Console(
-        file=file,
-        no_color=True,
-        highlight=False,
-        width=119,
-    )
 
     hdlr = RichFileHandler(
-        console=file_console,
+        log_name=name,
+        max_bytes=max_bytes,
+        compress=compress,
         show_path=False,
         show_time=False,
         show_level=False,
@@ -214,13 +396,24 @@ def set_file_logger(name=pyw_name):
     )
     hdlr.setFormatter(file_formatter)
 
+    for h in logger.handlers:
+        if isinstance(h, RichFileHandler):
+            h.close()
     logger.handlers = [h for h in logger.handlers if not isinstance(
         h, (logging.FileHandler, RichFileHandler))]
     logger.addHandler(hdlr)
-    logger.log_file = log_file
+    logger.log_file = hdlr.log_file
+
 
+def flush():
+    """
+    Block until logs are written to file.
+    """
+    for hdlr in logger.handlers:
+        hdlr.flush()
 
-def set_func_logger(func):
+
+def get_web_handler(func=None, handler_class=RichRenderableHandler):
     console = HTMLConsole(
         force_terminal=False,
         force_interactive=False,
@@ -231,7 +424,7 @@ def set_func_logger(func):
         highlighter=Highlighter(),
         theme=WEB_THEME
     )
-    hdlr = RichRenderableHandler(
+    hdlr = handler_class(
         func=func,
         console=console,
         show_path=False,
@@ -243,6 +436,16 @@ def set_func_logger(func):
         highlighter=Highlighter(),
     )
     hdlr.setFormatter(web_formatter)
+    return hdlr
+
+
+def set_func_logger(func, structured=False):
+    """
+    Args:
+        func: Function to receive logs.
+        structured (bool): True to receive plain records instead of renderables.
+    """
+    hdlr = get_web_handler(func, handler_class=StructuredLogHandler if structured else RichRenderableHandler)
     logger.handlers = [h for h in logger.handlers if not isinstance(
         h, RichRenderableHandler)]
     logger.addHandler(hdlr)
@@ -278,6 +481,8 @@ def print(*objects: ConsoleRenderable, **kwargs):
         if isinstance(hdlr, RichRenderableHandler):
             for renderable in _get_renderables(hdlr.console, *objects, **kwargs):
                 hdlr._func(renderable)
+        elif isinstance(hdlr, RichFileHandler):
+            hdlr.print(*objects)
         elif isinstance(hdlr, RichHandler):
             hdlr.console.print(*objects)
 
@@ -351,6 +556,7 @@ logger.set_file_logger = set_file_logger
 logger.set_func_logger = set_func_logger
 logger.rule = rule
 logger.print = print
+logger.flush = flush
 logger.log_file: str
 
 logger.set_file_logger()
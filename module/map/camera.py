@@ -28,6 +28,8 @@ class Camera(MapOperation):
     grid_class = Grid
     _prev_view = None
     _prev_swipe = None
+    # Camera movement of the last swipe, in grids, for incremental map detection
+    _detect_swipe = None
 
     def _map_swipe(self, vector, box=(123, 159, 1175, 628)):
         """
@@ -54,6 +56,7 @@ class Camera(MapOperation):
             else:
                 whitelist, blacklist = None, None
 
+            self._detect_swipe = vector
             vector = distance * vector
             vector = -vector
             self.device.swipe_vector(vector, name=name, box=box, whitelist_area=whitelist, blacklist_area=blacklist)
@@ -122,7 +125,8 @@ class Camera(MapOperation):
                     and not self.is_in_strategy_submarine_move():
                 logger.warning('Image to detect is not in_map')
                 raise MapDetectionError('Image to detect is not in_map')
-            self.view.load(self.device.image)
+            self.view.load(self.device.image, swipe=self._detect_swipe)
+            self._detect_swipe = None
         except MapDetectionError as e:
             if self.info_bar_count():
                 logger.warning('Perspective error caused by info bar')
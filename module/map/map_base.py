@@ -1,8 +1,11 @@
 import copy
+import operator
 
+from module.base.decorator import cached_property
 from module.base.utils import location2node, node2location
 from module.logger import logger
-from module.map.map_grids import SelectedGrids
+from module.map.map_graph import MapGraph
+from module.map.map_grids import SelectedGrids, attr_matcher
 from module.map.utils import *
 from module.map_detection.grid_info import GridInfo
 
@@ -34,6 +37,8 @@ class CampaignMap:
         self.poor_map_data = False
         self.camera_sight = (-3, -1, 3, 2)
         self.grid_connection = {}
+        # Key: (wall, portal), value: (grid_connection, MapGraph)
+        self._topology = {}
 
     def __iter__(self):
         return iter(self.grids.values())
@@ -256,7 +261,38 @@ class CampaignMap:
         """
         logger.info(f'grid_connection: wall={wall}, portal={portal}')
 
+        # Map topology is static, compile once for each combination and reuse it in later runs.
+        key = (bool(wall), bool(portal))
+        if key not in self._topology:
+            connection = self._grid_connection_build(wall=wall, portal=portal)
+            self._topology[key] = (connection, MapGraph(self.grids.keys(), connection))
+        connection, graph = self._topology[key]
+        # Cached connections are shared, they should not be modified
+        self.grid_connection = connection
+        self.graph = graph
+
+        # Create portal link
+        for start, end in self._portal_data:
+            if portal:
+                self[start].is_portal = True
+                self[start].portal_link = end
+            else:
+                self[start].is_portal = False
+                self[start].portal_link = None
+
+        return True
+
+    def _grid_connection_build(self, wall=False, portal=False):
+        """
+        Args:
+            wall (bool): If use wall_data
+            portal (bool): If use portal_data
+
+        Returns:
+            dict: Key: grid location, value: set of connected locations.
+        """
         # Generate grid connection.
+        grid_connection = {}
         total = set([grid for grid in self.grids.keys()])
         for grid in self:
             connection = set()
@@ -264,7 +300,7 @@ class CampaignMap:
                 arr = tuple(arr + grid.location)
                 if arr in total:
                     connection.add(arr)
-            self.grid_connection[grid.location] = connection
+            grid_connection[grid.location] = connection
 
         # Use wall_data to delete connection.
         if wall and self._wall_data:
@@ -284,22 +320,48 @@ class CampaignMap:
             for g1, g2 in disconnect:
                 g1 = tuple(g1.tolist())
                 g2 = tuple(g2.tolist())
-                self.grid_connection[g1].remove(g2)
-                self.grid_connection[g2].remove(g1)
+                grid_connection[g1].remove(g2)
+                grid_connection[g2].remove(g1)
 
         # Create portal link
         for start, end in self._portal_data:
             if portal:
-                self.grid_connection[start].add(end)
-                self[start].is_portal = True
-                self[start].portal_link = end
+                grid_connection[start].add(end)
             else:
-                if end in self.grid_connection[start]:
-                    self.grid_connection[start].remove(end)
-                self[start].is_portal = False
-                self[start].portal_link = None
+                if end in grid_connection[start]:
+                    grid_connection[start].remove(end)
 
-        return True
+        return grid_connection
+
+    @cached_property
+    def graph(self):
+        """
+        Returns:
+            MapGraph: Compiled from grid_connection, replaced in grid_connection_initial().
+        """
+        return MapGraph(self.grids.keys(), self.grid_connection)
+
+    def _find_path_masks(self, has_ambush=True, has_enemy=True):
+        """
+        Args:
+            has_ambush (bool): MAP_HAS_AMBUSH
+            has_enemy (bool): False if only sea and land are considered
+
+        Returns:
+            list[GridInfo]: Grids in the order of graph.
+            list[int]: Cost to enter each grid.
+            list[bool]: Grids that can't be entered.
+            list[bool]: Grids that can be passed through.
+        """
+        ambush_cost = 10 if has_ambush else 1
+        grids = [self.grids[location] for location in self.graph.locations]
+        weight = [ambush_cost if grid.may_ambush else 1 for grid in grids]
+        blocked = [grid.is_land or grid.is_mechanism_block for grid in grids]
+        if has_enemy:
+            expand = [grid.is_sea for grid in grids]
+        else:
+            expand = [True] * len(grids)
+        return grids, weight, blocked, expand
 
     def show(self):
         # logger.info('Showing grids:')
@@ -518,36 +580,12 @@ class CampaignMap:
             has_enemy (bool): False if only sea and land are considered
         """
         location = location_ensure(location)
-        ambush_cost = 10 if has_ambush else 1
-        for grid in self:
-            grid.cost = 9999
-            grid.connection = None
-        start = self[location]
-        start.cost = 0
-        visited = [start]
-        visited = set(visited)
-
-        while 1:
-            new = visited.copy()
-            for grid in visited:
-                for arr in self.grid_connection[grid.location]:
-                    arr = self[arr]
-                    if arr.is_land or arr.is_mechanism_block:
-                        continue
-                    cost = ambush_cost if arr.may_ambush else 1
-                    cost += grid.cost
-
-                    if cost < arr.cost:
-                        arr.cost = cost
-                        arr.connection = grid.location
-                    elif cost == arr.cost:
-                        if abs(arr.location[0] - grid.location[0]) == 1:
-                            arr.connection = grid.location
-                    if arr.is_sea or not has_enemy:
-                        new.add(arr)
-            if len(new) == len(visited):
-                break
-            visited = new
+        graph = self.graph
+        grids, weight, blocked, expand = self._find_path_masks(has_ambush=has_ambush, has_enemy=has_enemy)
+        cost, pred = graph.shortest_path(graph.index[location], weight, blocked, expand)
+        for grid, c, p in zip(grids, cost, pred):
+            grid.cost = c
+            grid.connection = graph.locations[p] if p >= 0 else None
 
         # self.show_cost()
         # self.show_connection()
@@ -559,14 +597,20 @@ class CampaignMap:
             current (tuple): Current location.
             has_ambush (bool): MAP_HAS_AMBUSH
         """
+        graph = self.graph
+        grids, weight, blocked, expand = self._find_path_masks(has_ambush=has_ambush)
+        # Search current fleet at last, so `cost` and `connection` are the ones of current fleet
         location_dict = sorted(location_dict.items(), key=lambda kv: (int(kv[1] == current),))
         for fleet, location in location_dict:
             if location == ():
                 continue
-            self.find_path_initial(location, has_ambush=has_ambush)
+            location = location_ensure(location)
+            cost, pred = graph.shortest_path(graph.index[location], weight, blocked, expand)
             attr = f'cost_{fleet}'
-            for grid in self:
-                grid.__setattr__(attr, grid.cost)
+            for grid, c, p in zip(grids, cost, pred):
+                grid.cost = c
+                grid.connection = graph.locations[p] if p >= 0 else None
+                grid.__setattr__(attr, c)
 
     def _find_path(self, location):
         """
@@ -709,10 +753,9 @@ class CampaignMap:
         missing['siren'] -= siren_count
         missing['carrier'] = carrier_count - self.select(is_enemy=True, may_enemy=False).count \
             if mode == 'carrier' else 0
-        for grid in self:
-            for attr in ['enemy', 'mystery', 'siren', 'boss']:
-                if grid.__getattribute__('is_' + attr):
-                    missing[attr] -= 1
+        getter = operator.attrgetter('is_enemy', 'is_mystery', 'is_siren', 'is_boss')
+        for attr, count in zip(['enemy', 'mystery', 'siren', 'boss'], map(sum, zip(*map(getter, self)))):
+            missing[attr] -= count
         missing['enemy'] += len(self.fortress_data[0]) - self.select(is_fortress=True).count
         for route in self.bouncing_enemy_data:
             if not route.select(may_bouncing_enemy=True):
@@ -774,16 +817,8 @@ class CampaignMap:
         Returns:
             SelectedGrids:
         """
-        result = []
-        for grid in self:
-            flag = True
-            for k, v in kwargs.items():
-                if grid.__getattribute__(k) != v:
-                    flag = False
-            if flag:
-                result.append(grid)
-
-        return SelectedGrids(result)
+        matched = attr_matcher(kwargs)
+        return SelectedGrids([grid for grid in self if matched(grid)])
 
     def to_selected(self, grids):
         """
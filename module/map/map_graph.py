@@ -0,0 +1,83 @@
+import heapq
+
+import numpy as np
+
+
+class MapGraph:
+    """
+    Compact graph of `CampaignMap.grid_connection`, for path finding.
+
+    Grids are indexed in the order of `locations`, neighbours are stored as CSR arrays,
+    built once when grid connection is initialized.
+    Grid states change after every map update, so they are passed in as masks on each search.
+    """
+
+    def __init__(self, locations, connection):
+        """
+        Args:
+            locations (list[tuple]): Grid locations.
+            connection (dict): Key: grid location, value: set of connected locations.
+        """
+        self.locations = list(locations)
+        self.index = {location: index for index, location in enumerate(self.locations)}
+        self.size = len(self.locations)
+
+        indptr = [0]
+        indices = []
+        for location in self.locations:
+            for to in sorted(connection.get(location, ())):
+                if to in self.index:
+                    indices.append(self.index[to])
+            indptr.append(len(indices))
+        self.indptr = np.array(indptr, dtype=np.int32)
+        self.indices = np.array(indices, dtype=np.int32)
+
+        # Whether an edge moves horizontally, routes prefer horizontal moves on equal costs
+        loca = np.array(self.locations, dtype=np.int32).reshape(-1, 2)
+        source = np.repeat(np.arange(self.size), np.diff(self.indptr))
+        self.horizontal = np.abs(loca[self.indices, 0] - loca[source, 0]) == 1
+
+        # Plain lists for the search loop, indexing numpy arrays element by element is slow
+        self.adjacency = [
+            list(zip(self.indices[start:end].tolist(), self.horizontal[start:end].tolist()))
+            for start, end in zip(indptr[:-1], indptr[1:])
+        ]
+
+    def shortest_path(self, source, weight, blocked, expand):
+        """
+        Dijkstra search from a grid.
+
+        Args:
+            source (int): Index of start grid.
+            weight (list[int]): Cost to enter each grid.
+            blocked (list[bool]): Grids that can't be entered.
+            expand (list[bool]): Grids that can be passed through, others can be reached but are dead ends.
+
+        Returns:
+            list[int]: Cost to reach each grid, 9999 if unreachable.
+            list[int]: Index of predecessor of each grid, -1 if none.
+        """
+        cost = [9999] * self.size
+        pred = [-1] * self.size
+        done = [False] * self.size
+        cost[source] = 0
+        heap = [(0, source)]
+        while heap:
+            current, u = heapq.heappop(heap)
+            if done[u]:
+                continue
+            done[u] = True
+            if u != source and not expand[u]:
+                continue
+            for v, horizontal in self.adjacency[u]:
+                if blocked[v]:
+                    continue
+                new = current + weight[v]
+                if new < cost[v]:
+                    cost[v] = new
+                    pred[v] = u
+                    heapq.heappush(heap, (new, v))
+                elif new == cost[v] and horizontal:
+                    pred[v] = u
+
+        return cost, pred
@@ -2,6 +2,50 @@ import operator
 import typing as t
 
 
+def attr_matcher(kwargs, type_check=False):
+    """
+    Create a function to check if a grid has all the given attributes.
+    Attributes are fetched at once by attrgetter, and compared as a tuple.
+
+    Args:
+        kwargs (dict): Attributes of Grid.
+        type_check (bool): True to also require the same type, such as `True` won't match `1`.
+
+    Returns:
+        callable: Function receives a grid and returns a bool.
+    """
+    if not kwargs:
+        return lambda grid: True
+
+    keys = tuple(kwargs.keys())
+    values = tuple(kwargs.values())
+    getter = operator.attrgetter(*keys)
+    if len(keys) == 1:
+        # attrgetter of one attribute returns the value itself
+        values = values[0]
+        if type_check:
+            value_type = type(values)
+
+            def matched(grid):
+                obj = getter(grid)
+                return type(obj) is value_type and obj == values
+
+            return matched
+        else:
+            return lambda grid: getter(grid) == values
+
+    if type_check:
+        types = tuple(type(value) for value in values)
+
+        def matched(grid):
+            obj = getter(grid)
+            return obj == values and tuple(type(value) for value in obj) == types
+
+        return matched
+    else:
+        return lambda grid: getter(grid) == values
+
+
 class SelectedGrids:
     def __init__(self, grids):
         self.grids = grids
@@ -72,14 +116,7 @@ class SelectedGrids:
         Returns:
             SelectedGrids:
         """
-        def matched(obj):
-            flag = True
-            for k, v in kwargs.items():
-                obj_v = obj.__getattribute__(k)
-                if type(obj_v) != type(v) or obj_v != v:
-                    flag = False
-            return flag
-
+        matched = attr_matcher(kwargs, type_check=True)
         return SelectedGrids([grid for grid in self.grids if matched(grid)])
 
     def create_index(self, *attrs):
@@ -276,7 +313,8 @@ class SelectedGrids:
         location = np.array(self.location)
         diff = np.sum(np.abs(location - camera), axis=1)
         # grids = [x for _, x in sorted(zip(diff, self.grids))]
-        grids = tuple(np.array(self.grids)[np.argsort(diff)])
+        # Index the list directly, np.array(self.grids) would create an object array of grids
+        grids = tuple(self.grids[index] for index in np.argsort(diff))
         return SelectedGrids(grids)
 
     def sort_by_clock_degree(self, center=(0, 0), start=(0, 1), clockwise=True):
@@ -299,7 +337,7 @@ class SelectedGrids:
         if not clockwise:
             theta = -theta
         theta[theta < 0] += 360
-        grids = tuple(np.array(self.grids)[np.argsort(theta)])
+        grids = tuple(self.grids[index] for index in np.argsort(theta))
         return SelectedGrids(grids)
 
 
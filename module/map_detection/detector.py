@@ -11,6 +11,8 @@ class MapDetector:
     """
     image: np.ndarray
     config: AzurLaneConfig
+    # Edges of the warped image, None if backend doesn't warp
+    image_edge: np.ndarray
 
     left_edge: bool
     right_edge: bool
@@ -41,15 +43,21 @@ class MapDetector:
         else:
             self.backend = Perspective(config=self.config)
 
-    def load(self, image):
+    def load(self, image, swipe=None):
         """
         Args:
             image: Shape (720, 1280, 3)
+            swipe (tuple, np.ndarray): Camera movement in grids since previous detection, if known.
+                Only homography backend uses it.
         """
-        self.backend.load(image)
+        if isinstance(self.backend, Homography):
+            self.backend.load(image, swipe=swipe)
+        else:
+            self.backend.load(image)
 
         self.left_edge = bool(self.backend.left_edge)
         self.right_edge = bool(self.backend.right_edge)
         self.lower_edge = bool(self.backend.lower_edge)
         self.upper_edge = bool(self.backend.upper_edge)
         self.generate = self.backend.generate
+        self.image_edge = getattr(self.backend, 'image_edge', None)
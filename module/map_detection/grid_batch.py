@@ -0,0 +1,213 @@
+from module.base.utils import *
+from module.map_detection.grid_predictor import GridPredictor
+from module.template.assets import *
+
+
+class GridBatchPredictor:
+    """
+    Predict all grids in a view together.
+
+    Instead of cropping and resizing grid by grid, the relative crops of all grids are sampled
+    into a tile atlas by one cv2.remap(), tiles are stacked vertically in the order of grids.
+    Color features and template matching then run once on the whole atlas.
+
+    Results are passed to GridPredictor.predict(features=...).
+    Methods that are overridden in grid class, such as EventGrid in campaigns, are still predicted grid by grid.
+    """
+
+    def __init__(self, grids, image, config):
+        """
+        Args:
+            grids (list[GridPredictor]):
+            image (np.ndarray): Shape (720, 1280, 3)
+            config (AzurLaneConfig):
+        """
+        self.grids = grids
+        self.image = image
+        self.config = config
+        self.n = len(grids)
+        # Shape (n, 4) and (n,), see GridPredictor.__init__()
+        self.center = np.array([grid._image_center for grid in grids], dtype=float).reshape(-1, 4)
+        self.a = np.array([grid._image_a for grid in grids], dtype=float)
+        # Key: (area, shape), value: np.ndarray
+        self._atlas = {}
+
+    def atlas(self, area, shape):
+        """
+        Batched GridPredictor.relative_crop().
+
+        Args:
+            area (tuple): upper_left_x, upper_left_y, bottom_right_x, bottom_right_y, such as (-1, -1, 1, 1).
+            shape (tuple): Output image shape of each grid, (width, height).
+
+        Returns:
+            np.ndarray: Shape (n * height, width, channel).
+        """
+        key = (tuple(area), tuple(shape))
+        if key in self._atlas:
+            return self._atlas[key]
+
+        w, h = shape
+        area = np.rint(self.center + np.array(area) * self.a[:, np.newaxis]).astype(int)
+        x1, y1, x2, y2 = area.T
+        # Sampling positions of cv2.resize(), with pixel centers aligned
+        map_x = x1[:, np.newaxis] + (np.arange(w) + 0.5) * ((x2 - x1) / w)[:, np.newaxis] - 0.5
+        map_y = y1[:, np.newaxis] + (np.arange(h) + 0.5) * ((y2 - y1) / h)[:, np.newaxis] - 0.5
+        map_x = np.broadcast_to(map_x[:, np.newaxis, :], (self.n, h, w)).reshape(-1, w).astype(np.float32)
+        map_y = np.broadcast_to(map_y[:, :, np.newaxis], (self.n, h, w)).reshape(-1, w).astype(np.float32)
+        # Follow the BICUBIC resize in relative_crop(), and the black background in crop()
+        image = cv2.remap(self.image, map_x, map_y, interpolation=cv2.INTER_CUBIC,
+                          borderMode=cv2.BORDER_CONSTANT, borderValue=(0, 0, 0))
+
+        self._atlas[key] = image
+        return image
+
+    def count(self, image):
+        """
+        Args:
+            image (np.ndarray): Binary atlas, shape (n * height, width).
+
+        Returns:
+            np.ndarray: Number of non-zero pixels in each grid, shape (n,).
+        """
+        return np.count_nonzero(image.reshape(self.n, -1), axis=1)
+
+    def match(self, image, template, shape, similarity=0.85):
+        """
+        Batched Template.match(), matching windows that cross two tiles are dropped.
+
+        Args:
+            image (np.ndarray): Atlas, shape (n * height, width).
+            template (Template):
+            shape (tuple): Shape of each grid, (width, height).
+            similarity (float): 0 to 1.
+
+        Returns:
+            np.ndarray: If matches in each grid, shape (n,).
+        """
+        h = shape[1]
+        templates = template.image if template.is_gif else [template.image]
+        sim = np.full(self.n, -1.)
+        for t in templates:
+            res = cv2.matchTemplate(image, t, cv2.TM_CCOEFF_NORMED)
+            rows = np.arange(self.n)[:, np.newaxis] * h + np.arange(h - t.shape[0] + 1)
+            sim = np.maximum(sim, res[rows].reshape(self.n, -1).max(axis=1))
+        return sim > similarity
+
+    def rgb_count(self, area, color, shape=(50, 50), threshold=221):
+        """
+        Batched GridPredictor.relative_rgb_count().
+        """
+        image = color_similarity_2d(self.atlas(area, shape=shape), color=color)
+        return self.count(image > threshold)
+
+    def hsv_count(self, area, h=(0, 360), s=(0, 100), v=(0, 100), shape=(50, 50)):
+        """
+        Batched GridPredictor.relative_hsv_count().
+        """
+        image = cv2.cvtColor(self.atlas(area, shape=shape), cv2.COLOR_RGB2HSV)
+        lower = (h[0] / 2, s[0] * 2.55, v[0] * 2.55)
+        upper = (h[1] / 2 + 1, s[1] * 2.55 + 1, v[1] * 2.55 + 1)
+        image = cv2.inRange(image, lower, upper)
+        return self.count(image)
+
+    def predict_enemy_scale(self):
+        shape = (50, 50)
+        image = self.atlas((-0.415 - 0.7, -0.62 - 0.7, -0.415, -0.62), shape=shape)
+        red = color_similarity_2d(image, (255, 130, 132))
+        yellow = color_similarity_2d(image, (255, 235, 156))
+
+        large = self.match(red, TEMPLATE_ENEMY_L, shape=shape, similarity=0.75)
+        middle = self.match(yellow, TEMPLATE_ENEMY_M, shape=shape)
+        small = self.match(yellow, TEMPLATE_ENEMY_S, shape=shape)
+        return np.select([large, middle, small], [3, 2, 1], default=0).tolist()
+
+    def predict_enemy_genre(self):
+        templates = self.grids[0].template_enemy_genre
+        if None in templates.values():
+            # Let GridPredictor raise the error
+            return [grid.predict_enemy_genre() for grid in self.grids]
+
+        genre = [None] * self.n
+        image_dic = {}
+        scaling_dic = self.config.MAP_ENEMY_GENRE_DETECTION_SCALING
+        for name, template in templates.items():
+            short_name = name[6:] if name.startswith('Siren_') else name
+            scaling = scaling_dic.get(short_name, 1)
+            scaling = (scaling,) if not isinstance(scaling, tuple) else scaling
+            for scale in scaling:
+                shape = tuple(np.round(np.array((60, 60)) * scale).astype(int).tolist())
+                if scale not in image_dic:
+                    image_dic[scale] = rgb2gray(self.atlas((-0.5, -1, 0.5, 0), shape=shape))
+
+                matched = self.match(image_dic[scale], template, shape=shape,
+                                     similarity=self.config.MAP_ENEMY_GENRE_SIMILARITY)
+                for index in np.where(matched)[0]:
+                    if genre[index] is None:
+                        genre[index] = name
+
+        return genre
+
+    def predict_boss(self):
+        shape = (50, 20)
+        image = color_similarity_2d(self.atlas((-0.55, -0.2, 0.45, 0.2), shape=shape), color=(255, 77, 82))
+        boss = self.match(image, TEMPLATE_ENEMY_BOSS, shape=shape, similarity=0.75)
+
+        # Small boss icon
+        area = (0.03, -0.15, 0.63, 0.15)
+        small = self.hsv_count(area=area, h=(358 - 3, 358 + 3), shape=shape) > 100
+        image = color_similarity_2d(self.atlas(area, shape=shape), color=(255, 77, 82))
+        small &= self.match(image, TEMPLATE_ENEMY_BOSS, shape=shape, similarity=0.7)
+
+        return (boss | small).tolist()
+
+    def predict_missile_attack(self):
+        return (self.rgb_count(area=(-0.5, -1, 0.5, 0), color=(255, 255, 60), shape=(50, 50)) > 35).tolist()
+
+    def predict_fleet(self):
+        shape = (50, 50)
+        image = color_similarity_2d(self.atlas((-1, -2, -0.5, -1.5), shape=shape), color=(255, 255, 255))
+        return self.match(image, TEMPLATE_FLEET_AMMO, shape=shape).tolist()
+
+    def predict_submarine(self):
+        shape = (50, 50)
+        image = color_similarity_2d(self.atlas((-0.86, 0.08, -0.36, 0.58), shape=shape), color=(255, 243, 156))
+        return self.match(image, TEMPLATE_SUBMARINE, shape=shape).tolist()
+
+    def predict_mystery(self):
+        # cyan question mark
+        return (self.rgb_count(
+            area=(-0.3, -2, 0.3, -0.6), color=(148, 255, 247), shape=(20, 50)) > 50).tolist()
+
+    def predict_current_fleet(self):
+        area = (-0.5, -3.5, 0.5, -2.5)
+        count = self.hsv_count(area=area, h=(141 - 3, 141 + 10), shape=(50, 50))
+
+        shape = (60, 60)
+        image = color_similarity_2d(self.atlas(area, shape=shape), color=(24, 255, 107))
+        matched = self.match(image, TEMPLATE_FLEET_CURRENT, shape=shape)
+        return ((count >= 600) & matched).tolist()
+
+    def predict(self):
+        if not self.n:
+            return
+        cls = type(self.grids[0])
+        if cls.predict is not GridPredictor.predict or any(type(grid) is not cls for grid in self.grids):
+            for grid in self.grids:
+                grid.predict()
+            return
+
+        methods = ['predict_enemy_scale', 'predict_enemy_genre', 'predict_boss', 'predict_submarine',
+                   'predict_fleet', 'predict_current_fleet']
+        if self.config.MAP_HAS_MYSTERY:
+            methods.append('predict_mystery')
+        if self.config.MAP_HAS_MISSILE_ATTACK:
+            methods.append('predict_missile_attack')
+
+        features = {}
+        for method in methods:
+            if getattr(cls, method) is getattr(GridPredictor, method):
+                features[method] = self.__getattribute__(method)()
+
+        for index, grid in enumerate(self.grids):
+            grid.predict(features={method: result[index] for method, result in features.items()})
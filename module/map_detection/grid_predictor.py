@@ -79,22 +79,33 @@ class GridPredictor:
         image_edge = cv2.morphologyEx(image_edge, cv2.MORPH_CLOSE, kernel)
         return image_edge
 
-    def predict(self):
-        self.enemy_scale = self.predict_enemy_scale()
-        self.enemy_genre = self.predict_enemy_genre()
-        self.is_boss = self.predict_boss()
-        self.is_submarine = self.predict_submarine()
+    def predict(self, features=None):
+        """
+        Args:
+            features (dict): Results of predict_* methods that are already calculated.
+                Key: method name, value: result. See GridBatchPredictor.
+        """
+
+        def get(method):
+            if features is not None and method in features:
+                return features[method]
+            return self.__getattribute__(method)()
+
+        self.enemy_scale = get('predict_enemy_scale')
+        self.enemy_genre = get('predict_enemy_genre')
+        self.is_boss = get('predict_boss')
+        self.is_submarine = get('predict_submarine')
         if self.is_submarine:
             self.is_fleet = False
         else:
-            self.is_fleet = self.predict_fleet()
+            self.is_fleet = get('predict_fleet')
         if self.config.MAP_HAS_MYSTERY:
-            self.is_mystery = self.predict_mystery()
-        self.is_current_fleet = self.predict_current_fleet()
+            self.is_mystery = get('predict_mystery')
+        self.is_current_fleet = get('predict_current_fleet')
         # self.is_caught_by_siren = self.predict_caught_by_siren()
 
         if self.config.MAP_HAS_MISSILE_ATTACK:
-            if self.predict_missile_attack():
+            if get('predict_missile_attack'):
                 self.is_missile_attack = True
         if self.enemy_genre:
             self.is_enemy = True
@@ -37,6 +37,8 @@ class Homography:
     """
     image: np.ndarray
     config: AzurLaneConfig
+    # Edges of the warped image, with UI removed
+    image_edge: np.ndarray
     # Four edges in bool, or has attribute __bool__
     left_edge: int
     right_edge: int
@@ -81,15 +83,17 @@ class Homography:
         image[:, -pad:] = 0
         return image
 
-    def load(self, image):
+    def load(self, image, swipe=None):
         """
         Args:
             image (np.ndarray): Shape (720, 1280, 3)
+            swipe (tuple, np.ndarray): Camera movement in grids since previous detection, if known.
+                Used to search free tile locally, see search_tile_local().
         """
         if not self.homo_loaded:
             self.load_homography(storage=self.config.HOMO_STORAGE, image=image)
 
-        self.detect(image)
+        self.detect(image, swipe=swipe)
 
     def load_homography(self, storage=None, perspective=None, image=None, file=None):
         """
@@ -153,10 +157,11 @@ class Homography:
         self.homo_size = tuple(size.tolist())
         self.homo_loaded = True
 
-    def detect(self, image):
+    def detect(self, image, swipe=None):
         """
         Args:
             image (np.ndarray): Screenshot.
+            swipe (tuple, np.ndarray): Camera movement in grids since previous detection, if known.
 
         Returns:
             bool: If success.
@@ -175,10 +180,15 @@ class Homography:
         image_edge = cv2.bitwise_and(image_edge, self.ui_mask_homo_stroke)
         kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
         image_edge = cv2.morphologyEx(image_edge, cv2.MORPH_CLOSE, kernel)
+        self.image_edge = image_edge
         # Image.fromarray(image_edge, mode='L').show()
 
         # Find free tile
-        if self.search_tile_center(image_edge, threshold_good=self.config.HOMO_CENTER_GOOD_THRESHOLD,
+        if swipe is not None and self.config.HOMO_INCREMENTAL \
+                and self.search_tile_local(image_edge, swipe=swipe, threshold=self.config.HOMO_CENTER_GOOD_THRESHOLD,
+                                           radius=self.config.HOMO_INCREMENTAL_RADIUS):
+            pass
+        elif self.search_tile_center(image_edge, threshold_good=self.config.HOMO_CENTER_GOOD_THRESHOLD,
                                    threshold=self.config.HOMO_CENTER_THRESHOLD):
             pass
         elif self.search_tile_corner(image_edge, threshold=self.config.HOMO_CORNER_THRESHOLD):
@@ -244,6 +254,54 @@ class Homography:
         logger.attr_align('tile_center', f'{float2str(similarity)} ({message})')
         return message != 'bad match'
 
+    def search_tile_local(self, image, swipe, threshold=0.9, radius=30):
+        """
+        Search for the center of empty tile, around the position predicted from previous detection.
+        This is a cheap replacement of search_tile_center() after map swipes,
+        only free tile found previously and its neighbours are checked.
+
+        Since `homo_loca` is a position modulo HOMO_TILE, it is still correct
+        if swipe didn't move as expected, as long as a free tile is found.
+
+        Args:
+            image (np.ndarray): Monochrome image.
+            swipe (tuple, np.ndarray): Camera movement in grids since previous detection.
+            threshold (float):
+            radius (int): Search radius around predicted positions, in pixel.
+
+        Returns:
+            bool: If success.
+        """
+        if not hasattr(self, 'homo_loca') or not hasattr(self, 'map_inner'):
+            return False
+
+        tile = np.array(self.config.HOMO_TILE)
+        h, w = image.shape[:2]
+        size = np.array(ASSETS.tile_center_image.shape[:2][::-1])
+        # Snap previous free tile to tile grid, then move it opposite to camera
+        base = self.homo_loca + self.config.HOMO_CENTER_OFFSET
+        predict = base + np.round((self.map_inner - base) / tile) * tile - np.multiply(swipe, tile)
+
+        similarity = 0.
+        for offset in [(0, 0), (1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1)]:
+            loca = predict + np.multiply(offset, tile)
+            x1, y1, x2, y2 = np.rint(area_pad((*loca, *(loca + size)), pad=-radius)).astype(int)
+            x1, y1, x2, y2 = max(x1, 0), max(y1, 0), min(x2, w), min(y2, h)
+            if x2 - x1 < size[0] or y2 - y1 < size[1]:
+                continue
+            result = cv2.matchTemplate(image[y1:y2, x1:x2], ASSETS.tile_center_image, cv2.TM_CCOEFF_NORMED)
+            _, sim, _, loca = cv2.minMaxLoc(result)
+            similarity = max(similarity, sim)
+            if sim > threshold:
+                loca = np.add(loca, (x1, y1))
+                self.homo_loca = loca - self.config.HOMO_CENTER_OFFSET
+                self.map_inner = loca
+                logger.attr_align('tile_local', f'{float2str(sim)} (good match)')
+                return True
+
+        logger.attr_align('tile_local', f'{float2str(similarity)} (bad match)')
+        return False
+
     def search_tile_corner(self, image, threshold=0.8, encourage=1.0):
         """
         Search for the corner of empty tile.
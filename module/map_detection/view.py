@@ -4,9 +4,10 @@ import time
 from module.base.utils import *
 from module.exception import MapDetectionError
 from module.logger import logger
-from module.map.map_grids import SelectedGrids
+from module.map.map_grids import SelectedGrids, attr_matcher
 from module.map_detection.detector import MapDetector
 from module.map_detection.grid import Grid
+from module.map_detection.grid_batch import GridBatchPredictor
 from module.map_detection.utils import *
 from module.map_detection.utils_assets import *
 
@@ -15,6 +16,7 @@ class View(MapDetector):
     grids: dict
     shape: np.ndarray
     center_loca: tuple
+    homo_origin: np.ndarray
     center_offset: np.ndarray
     swipe_base: np.ndarray
 
@@ -49,14 +51,15 @@ class View(MapDetector):
         else:
             return cv2.copyTo(image, ASSETS.ui_mask_in_map)
 
-    def load(self, image):
+    def load(self, image, swipe=None):
         """
         Args:
             image:
+            swipe (tuple, np.ndarray): Camera movement in grids since previous load, if known.
         """
         image = self._image_clear_ui(np.array(image))
         self.image = image
-        super().load(image)
+        super().load(image, swipe=swipe)
 
         # Create local view map
         grids = {}
@@ -81,6 +84,13 @@ class View(MapDetector):
             self.grids = grids
         self.shape = np.max(list(self.grids.keys()), axis=0)
 
+        # Position of grid (0, 0) on warped image
+        if self.image_edge is not None:
+            grid = next(iter(self.grids.values()))
+            origin = perspective_transform(
+                np.subtract([grid.corner[0]], self.config.DETECTING_AREA[:2]), data=self.backend.homo_data)[0]
+            self.homo_origin = origin - np.multiply(grid.location, self.config.HOMO_TILE)
+
         # Find local view center
         for loca, grid in self.grids.items():
             offset = grid.screen2grid([self.config.SCREEN_CENTER])[0].astype(int)
@@ -102,8 +112,11 @@ class View(MapDetector):
         Predict grid info.
         """
         start_time = time.time()
-        for grid in self:
-            grid.predict()
+        if self.config.GRID_PREDICT_BATCH:
+            GridBatchPredictor(list(self), image=self.image, config=self.config).predict()
+        else:
+            for grid in self:
+                grid.predict()
         logger.attr_align('predict', len(self.grids.keys()), front=float2str(time.time() - start_time) + 's')
 
     def update(self, image):
@@ -125,16 +138,35 @@ class View(MapDetector):
         Returns:
             SelectedGrids:
         """
-        result = []
-        for grid in self:
-            flag = True
-            for k, v in kwargs.items():
-                if grid.__getattribute__(k) != v:
-                    flag = False
-            if flag:
-                result.append(grid)
+        matched = attr_matcher(kwargs)
+        return SelectedGrids([grid for grid in self if matched(grid)])
 
-        return SelectedGrids(result)
+    def _predict_swipe_phase(self, prev, tolerance=0.2):
+        """
+        Find map movement by phase correlation on the warped edge images of two views.
+
+        Args:
+            prev (View): View instance after swipe.
+            tolerance (float): Movement should be integer grids, in a tolerance of this.
+
+        Returns:
+            np.ndarray, float: Movement of grids in grids, such as (-2, 0), or None if unable to predict.
+                Response of phase correlation.
+        """
+        if self.image_edge.shape != prev.image_edge.shape:
+            return None, 0.
+        image1 = self.image_edge.astype(np.float32)
+        image2 = prev.image_edge.astype(np.float32)
+        window = cv2.createHanningWindow(image1.shape[::-1], cv2.CV_32F)
+        shift, response = cv2.phaseCorrelate(image1, image2, window)
+        if response < self.config.MAP_SWIPE_PREDICT_PHASE_RESPONSE:
+            return None, response
+
+        move = (np.subtract(self.homo_origin, prev.homo_origin) + shift) / self.config.HOMO_TILE
+        rounded = np.round(move)
+        if np.any(np.abs(move - rounded) > tolerance):
+            return None, response
+        return rounded.astype(int), response
 
     def predict_swipe(self, prev, with_current_fleet=True, with_sea_grids=True):
         """
@@ -142,7 +174,8 @@ class View(MapDetector):
             prev (View): View instance after swipe.
             with_current_fleet (bool): If use the green arrow on current fleet to predict.
             with_sea_grids (bool): If use all sea grids to predict.
-                Note that this have a certain error rate.
+                Map movement is found by phase correlation if detection backend is homography,
+                otherwise by matching grids in pairs, which have a certain error rate.
 
         Returns:
             tuple[int]: (x, y). Or None if unable to predict.
@@ -172,7 +205,14 @@ class View(MapDetector):
                             f', current fleet match)')
                 return diff
 
-        if with_sea_grids:
+        if with_sea_grids and self.image_edge is not None and prev.image_edge is not None:
+            move, response = self._predict_swipe_phase(prev)
+            if move is not None:
+                diff = tuple((-move - offset).tolist())
+                logger.info(f'Map swipe predict: {diff} '
+                            f'({float2str(time.time() - start_time) + "s"}, phase correlation {float2str(response)})')
+                return diff
+        elif with_sea_grids:
             # Brute force to find swipe
             swipes = []
             for current_loca, current_piece in self.grids.items():
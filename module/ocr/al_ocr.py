@@ -1,4 +1,5 @@
 import os
+import threading
 
 import cv2
 import numpy as np
@@ -40,6 +41,26 @@ class AlOcr(CnOcr):
     ):
         self._args = (model_name, model_epoch, cand_alphabet, root, context, name)
         self._model_loaded = False
+        # Models can be preloaded in another thread, see OcrModel.preload()
+        self._load_lock = threading.Lock()
+
+    def load(self, warmup=False):
+        """
+        Load model if not loaded.
+
+        Args:
+            warmup (bool): True to run a prediction on a blank image after loading,
+                so memory allocations in mxnet won't happen in the first real OCR.
+        """
+        if self._model_loaded:
+            return
+        with self._load_lock:
+            if self._model_loaded:
+                return
+            self.init(*self._args)
+            if warmup:
+                super().ocr_for_single_lines([np.zeros((self._hp.img_height, 64), dtype=np.uint8)])
+            self._model_loaded = True
 
     def init(self,
              model_name='densenet-lite-gru',
@@ -84,31 +105,19 @@ class AlOcr(CnOcr):
         self._mod = self._get_module(AlOcr.CNOCR_CONTEXT)
 
     def ocr(self, img_fp):
-        if not self._model_loaded:
-            self.init(*self._args)
-            self._model_loaded = True
-
+        self.load()
         return super().ocr(img_fp)
 
     def ocr_for_single_line(self, img_fp):
-        if not self._model_loaded:
-            self.init(*self._args)
-            self._model_loaded = True
-
+        self.load()
         return super().ocr_for_single_line(img_fp)
 
     def ocr_for_single_lines(self, img_list):
-        if not self._model_loaded:
-            self.init(*self._args)
-            self._model_loaded = True
-
+        self.load()
         return super().ocr_for_single_lines(img_list)
 
     def set_cand_alphabet(self, cand_alphabet):
-        if not self._model_loaded:
-            self.init(*self._args)
-            self._model_loaded = True
-
+        self.load()
         return super().set_cand_alphabet(cand_alphabet)
 
     def _assert_and_prepare_model_files(self):
@@ -163,11 +172,22 @@ class AlOcr(CnOcr):
         :return: np.ndarray, with shape (1, height, width)
         """
         # Resize image using `cv2.resize` instead of `mxnet.image.imresize`
-        new_width = int(round(self._hp.img_height / img.shape[0] * img.shape[1]))
-        img = cv2.resize(img, (new_width, self._hp.img_height))
+        img = cv2.resize(img, (self.resized_width(img), self._hp.img_height))
         img = np.expand_dims(img, 0).astype('float32') / 255.0
         return img
 
+    def resized_width(self, img):
+        """
+        Args:
+            img (np.ndarray): Shape (height, width) or (height, width, channel).
+
+        Returns:
+            int: Image width after resizing to model height.
+                Lines are zero-padded to the widest one in a batch, only lines of the same width
+                get the same results whether they are predicted together or alone.
+        """
+        return int(round(self._hp.img_height / img.shape[0] * img.shape[1]))
+
     def _gen_line_pred_chars(self, line_prob, img_width, max_img_width):
         """
         Get the predicted characters.
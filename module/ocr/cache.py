@@ -0,0 +1,109 @@
+import hashlib
+from collections import OrderedDict
+
+from module.base.utils import *
+
+
+class OcrCache:
+    """
+    LRU cache of OCR model results, keyed on (lang, alphabet, hash of pre-processed image).
+
+    Handlers usually poll the same OCR area while waiting for something else to change,
+    images after pre-processing are identical across frames, so model invocations can be skipped.
+    Results are the raw model outputs, `Ocr.after_process()` still runs on every call.
+    """
+
+    def __init__(self, size=256):
+        """
+        Args:
+            size (int): Max cached images, 0 to disable.
+        """
+        self.size = size
+        self.cache = OrderedDict()
+        self.hit = 0
+        self.miss = 0
+
+    def clear(self):
+        self.cache.clear()
+
+    def resize(self, size):
+        """
+        Args:
+            size (int): Max cached images, 0 to disable.
+        """
+        self.size = max(int(size), 0)
+        while len(self.cache) > self.size:
+            self.cache.popitem(last=False)
+
+    def clear_stats(self):
+        self.hit = 0
+        self.miss = 0
+
+    @staticmethod
+    def image_key(lang, alphabet, image):
+        """
+        Args:
+            lang (str):
+            alphabet (str): Candidate alphabet, or None.
+            image (np.ndarray): Pre-processed image.
+
+        Returns:
+            tuple:
+        """
+        image = np.ascontiguousarray(image)
+        digest = hashlib.blake2b(image, digest_size=16).digest()
+        return lang, alphabet, image.shape, image.dtype.str, digest
+
+    def ocr_for_single_lines(self, model, lang, alphabet, image_list):
+        """
+        Same as `model.ocr_for_single_lines(image_list)`, but only predicts images not in cache.
+
+        Args:
+            model (AlOcr, ModelProxy):
+            lang (str):
+            alphabet (str): Candidate alphabet, or None.
+            image_list (list[np.ndarray]): Pre-processed images.
+
+        Returns:
+            list[list[str]]:
+        """
+        if not self.size:
+            model.set_cand_alphabet(alphabet)
+            return model.ocr_for_single_lines(image_list)
+
+        keys = [self.image_key(lang, alphabet, image) for image in image_list]
+        results = [None] * len(keys)
+        missing = []
+        for index, key in enumerate(keys):
+            try:
+                results[index] = self.cache[key]
+                self.cache.move_to_end(key)
+                self.hit += 1
+            except KeyError:
+                missing.append(index)
+                self.miss += 1
+
+        if missing:
+            # Set alphabet only when needed, models are lazy loaded
+            model.set_cand_alphabet(alphabet)
+            predicted = model.ocr_for_single_lines([image_list[index] for index in missing])
+            for index, result in zip(missing, predicted):
+                results[index] = result
+                self.cache[keys[index]] = result
+            while len(self.cache) > self.size:
+                self.cache.popitem(last=False)
+
+        return results
+
+    @property
+    def hit_rate(self):
+        total = self.hit + self.miss
+        return self.hit / total if total else 0.
+
+    def show(self):
+        from module.logger import logger
+        logger.info(f'Ocr cache: hit={self.hit}, miss={self.miss}, hit_rate={float2str(self.hit_rate)}')
+
+
+# Resized to OCR_CACHE_SIZE in config at scheduler start
+OCR_CACHE = OcrCache()
@@ -1,4 +1,7 @@
+import threading
+
 from module.base.decorator import cached_property
+from module.logger import logger
 from module.ocr.al_ocr import AlOcr
 
 
@@ -44,5 +47,26 @@ class OcrModel:
         # _num_classes: 5322
         return AlOcr(model_name='densenet-lite-gru', model_epoch=63, root='./bin/cnocr_models/tw', name='tw')
 
+    def preload(self, langs=('azur_lane',)):
+        """
+        Load models and warm them up in a background thread.
+        OCR calls during preloading just wait for the model to be ready.
+
+        Args:
+            langs (list[str], tuple[str]):
+        """
+        # Create models in caller thread, cached_property is not thread safe
+        models = [self.__getattribute__(lang) for lang in langs]
+
+        def load():
+            for model in models:
+                try:
+                    model.load(warmup=True)
+                except Exception as e:
+                    # Let the OCR calls raise it again
+                    logger.warning(f'Failed to preload OCR model: {e}')
+
+        threading.Thread(target=load, name='OcrPreload', daemon=True).start()
+
 
 OCR_MODEL = OcrModel()
\ No newline at end of file
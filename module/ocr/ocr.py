@@ -4,8 +4,10 @@ from typing import TYPE_CHECKING
 
 from module.base.button import Button
 from module.base.decorator import cached_property
+from module.base.frame_cache import FRAME_CACHE
 from module.base.utils import *
 from module.logger import logger
+from module.ocr.cache import OCR_CACHE
 from module.ocr.rpc import ModelProxyFactory
 from module.webui.setting import State
 
@@ -21,6 +23,8 @@ else:
 class Ocr:
     SHOW_LOG = True
     SHOW_REVISE_WARNING = False
+    # Reuse results of identical images, see OcrCache
+    USE_CACHE = True
 
     def __init__(self, buttons, lang='azur_lane', letter=(255, 255, 255), threshold=128, alphabet=None, name=None):
         """
@@ -66,6 +70,26 @@ class Ocr:
 
         return image.astype(np.uint8)
 
+    def pre_process_area(self, image, area):
+        """
+        Crop an area from screenshot and pre-process it.
+        Built-in pre-processes are cached on current frame, see FrameCache.
+
+        Args:
+            image (np.ndarray): Screenshot.
+            area (tuple):
+
+        Returns:
+            np.ndarray: Shape (width, height)
+        """
+        pre_process = type(self).pre_process
+        if pre_process is Ocr.pre_process or pre_process is OcrYuv.pre_process:
+            key = ('ocr', pre_process.__qualname__, FRAME_CACHE.area_key(area), tuple(self.letter), self.threshold)
+            return FRAME_CACHE.cached(
+                image, key, lambda: self.pre_process(FRAME_CACHE.crop(image, area, copy=False)))
+        else:
+            return self.pre_process(crop(image, area))
+
     def after_process(self, result):
         """
         Args:
@@ -87,16 +111,19 @@ class Ocr:
         """
         start_time = time.time()
 
-        self.cnocr.set_cand_alphabet(self.alphabet)
         if direct_ocr:
             image_list = [self.pre_process(i) for i in image]
         else:
-            image_list = [self.pre_process(crop(image, area)) for area in self.buttons]
+            image_list = [self.pre_process_area(image, area) for area in self.buttons]
 
         # This will show the images feed to OCR model
         # self.cnocr.debug(image_list)
 
-        result_list = self.cnocr.ocr_for_single_lines(image_list)
+        if self.USE_CACHE:
+            result_list = OCR_CACHE.ocr_for_single_lines(self.cnocr, self.lang, self.alphabet, image_list)
+        else:
+            self.cnocr.set_cand_alphabet(self.alphabet)
+            result_list = self.cnocr.ocr_for_single_lines(image_list)
         result_list = [''.join(result) for result in result_list]
         result_list = [self.after_process(result) for result in result_list]
 
@@ -1,16 +1,48 @@
 import argparse
 import multiprocessing
 import pickle
+import time
 
 from module.logger import logger
 from module.webui.setting import State
 
 process: multiprocessing.Process = None
+# Version of request format.
+# 1: Pickled images, alphabet set by set_cand_alphabet(). Servers without version() are version 1.
+# 2: Packed images, alphabet sent with each request.
+RPC_VERSION = 2
+
+
+def pack_image(image):
+    """
+    Pack image into raw buffer, much smaller and faster than pickle.
+
+    Args:
+        image (np.ndarray):
+
+    Returns:
+        list: [buffer, shape, dtype]
+    """
+    return [image.tobytes(), list(image.shape), image.dtype.str]
+
+
+def unpack_image(data):
+    """
+    Args:
+        data (list): [buffer, shape, dtype]
+
+    Returns:
+        np.ndarray:
+    """
+    import numpy as np
+    buffer, shape, dtype = data
+    return np.frombuffer(buffer, dtype=dtype).reshape(shape)
 
 
 class ModelProxy:
     client = None
     online = True
+    version = RPC_VERSION
 
     @classmethod
     def init(cls, address="127.0.0.1:22268"):
@@ -24,9 +56,43 @@ class ModelProxy:
         except:
             cls.online = False
             logger.warning("Ocr server not running")
+            return
+        try:
+            cls.version = min(cls.client.version(), RPC_VERSION)
+        except:
+            cls.version = 1
+        if cls.version < RPC_VERSION:
+            logger.warning(f"Ocr server is outdated, using request format of version {cls.version}")
 
     def __init__(self, lang) -> None:
         self.lang = lang
+        # Alphabet is sent with each request, since the server is shared by all instances
+        self.cand_alphabet = None
+
+    def _call(self, method, img):
+        """
+        Args:
+            method (str):
+            img (np.ndarray, list[np.ndarray]):
+
+        Returns:
+            Result from OCR server.
+        """
+        if self.version >= 2:
+            if isinstance(img, list):
+                return self.client(method, self.lang, self.cand_alphabet, [pack_image(i) for i in img])
+            return self.client(method, self.lang, self.cand_alphabet, pack_image(img))
+        else:
+            self.client("set_cand_alphabet", self.lang, self.cand_alphabet)
+            if isinstance(img, list):
+                return self.client(method, self.lang, [i.dumps() for i in img])
+            return self.client(method, self.lang, img.dumps())
+
+    def local_model(self):
+        from module.ocr.models import OCR_MODEL
+        model = OCR_MODEL.__getattribute__(self.lang)
+        model.set_cand_alphabet(self.cand_alphabet)
+        return model
 
     def ocr(self, img_fp):
         """
@@ -37,13 +103,11 @@ class ModelProxy:
 
         """
         if self.online:
-            img_str = img_fp.dumps()
             try:
-                return self.client("ocr", self.lang, img_str)
+                return self._call("ocr", img_fp)
             except:
                 self.online = False
-        from module.ocr.models import OCR_MODEL
-        return OCR_MODEL.__getattribute__(self.lang).ocr(img_fp)
+        return self.local_model().ocr(img_fp)
 
     def ocr_for_single_line(self, img_fp):
         """
@@ -54,13 +118,11 @@ class ModelProxy:
 
         """
         if self.online:
-            img_str = img_fp.dumps()
             try:
-                return self.client("ocr_for_single_line", self.lang, img_str)
+                return self._call("ocr_for_single_line", img_fp)
             except:
                 self.online = False
-        from module.ocr.models import OCR_MODEL
-        return OCR_MODEL.__getattribute__(self.lang).ocr_for_single_line(img_fp)
+        return self.local_model().ocr_for_single_line(img_fp)
 
     def ocr_for_single_lines(self, img_list):
         """
@@ -71,22 +133,14 @@ class ModelProxy:
 
         """
         if self.online:
-            img_str_list = [img_fp.dumps() for img_fp in img_list]
             try:
-                return self.client("ocr_for_single_lines", self.lang, img_str_list)
+                return self._call("ocr_for_single_lines", img_list)
             except:
                 self.online = False
-        from module.ocr.models import OCR_MODEL
-        return OCR_MODEL.__getattribute__(self.lang).ocr_for_single_lines(img_list)
+        return self.local_model().ocr_for_single_lines(img_list)
 
     def set_cand_alphabet(self, cand_alphabet: str):
-        if self.online:
-            try:
-                return self.client("set_cand_alphabet", self.lang, cand_alphabet)
-            except:
-                self.online = False
-        from module.ocr.models import OCR_MODEL
-        return OCR_MODEL.__getattribute__(self.lang).set_cand_alphabet(cand_alphabet)
+        self.cand_alphabet = cand_alphabet
 
     def debug(self, img_list):
         """
@@ -96,67 +150,255 @@ class ModelProxy:
         Returns:
 
         """
-        if self.online:
-            img_str_list = [img_fp.dumps() for img_fp in img_list]
-            try:
-                return self.client("debug", self.lang, img_str_list)
-            except:
-                self.online = False
-        from module.ocr.models import OCR_MODEL
-        return OCR_MODEL.__getattribute__(self.lang).debug(img_list)
+        return self.local_model().debug(img_list)
 
 
 class ModelProxyFactory:
+    def __init__(self):
+        self.proxies = {}
+
     def __getattribute__(self, __name: str) -> ModelProxy:
         if __name in ["azur_lane", "cnocr", "jp", "tw"]:
             if ModelProxy.client is None:
                 ModelProxy.init(address=State.deploy_config.OcrClientAddress)
-            return ModelProxy(lang=__name)
+            # Reuse proxies, so alphabet set by set_cand_alphabet() is kept
+            proxies = super().__getattribute__("proxies")
+            if __name not in proxies:
+                proxies[__name] = ModelProxy(lang=__name)
+            return proxies[__name]
         else:
             return super().__getattribute__(__name)
 
 
-def start_ocr_server(port=22268):
+class OcrBatcher:
+    """
+    Coalesce concurrent requests of one model into micro-batches.
+
+    Requests from all instances are queued, and the first one in queue waits `WINDOW` seconds
+    for others to come. Lines are zero-padded to the widest one in a model call, so only requests
+    whose images have the same width after resizing are merged, grouped by (alphabet, width).
+    Other requests are predicted on their own, results never depend on requests from other instances.
+    Runs in gevent, same as zerorpc server.
+    """
+    # Seconds to wait for more requests
+    WINDOW = 0.005
+    # Max images in a batch
+    MAX_BATCH = 64
+
+    def __init__(self, model):
+        """
+        Args:
+            model (AlOcr):
+        """
+        import gevent
+        from gevent.queue import Queue
+        self.model = model
+        # Element: (alphabet, img_list, AsyncResult, time queued)
+        self.queue = Queue()
+        self.requests = 0
+        self.images = 0
+        self.batches = 0
+        self.latency_total = 0.
+        self.latency_max = 0.
+        self.greenlet = gevent.spawn(self._loop)
+
+    def ocr_for_single_lines(self, alphabet, img_list):
+        """
+        Args:
+            alphabet (str): Candidate alphabet, or None.
+            img_list (list[np.ndarray]):
+
+        Returns:
+            list[list[str]]:
+        """
+        from gevent.event import AsyncResult
+        result = AsyncResult()
+        self.queue.put((alphabet, img_list, result, time.time()))
+        return result.get()
+
+    def _loop(self):
+        import gevent
+        while 1:
+            requests = [self.queue.get()]
+            gevent.sleep(self.WINDOW)
+            count = len(requests[0][1])
+            while count < self.MAX_BATCH and not self.queue.empty():
+                request = self.queue.get_nowait()
+                requests.append(request)
+                count += len(request[1])
+
+            groups = {}
+            for request in requests:
+                groups.setdefault(self._group_key(request), []).append(request)
+            for key, group in groups.items():
+                self._predict(key[0], group)
+
+    def _group_key(self, request):
+        """
+        Args:
+            request (tuple): (alphabet, img_list, AsyncResult, time queued)
+
+        Returns:
+            tuple: (alphabet, width) if all images have the same resized width,
+                or (alphabet, id) to predict the request alone.
+        """
+        alphabet, img_list = request[0], request[1]
+        try:
+            self.model.load()
+            widths = set(self.model.resized_width(img) for img in img_list)
+        except Exception:
+            widths = set()
+        if len(widths) == 1:
+            return alphabet, widths.pop()
+        return alphabet, id(request)
+
+    def _predict(self, alphabet, requests):
+        images = [img for request in requests for img in request[1]]
+        try:
+            self.model.set_cand_alphabet(alphabet)
+            results = self.model.ocr_for_single_lines(images)
+        except Exception as e:
+            for request in requests:
+                request[2].set_exception(e)
+            return
+
+        now = time.time()
+        self.batches += 1
+        index = 0
+        for _, img_list, result, queued in requests:
+            result.set(results[index:index + len(img_list)])
+            index += len(img_list)
+            latency = now - queued
+            self.requests += 1
+            self.images += len(img_list)
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+
+    def stats(self, reset=False):
+        """
+        Args:
+            reset (bool): Whether to reset counters.
+
+        Returns:
+            dict:
+        """
+        out = {
+            'queue': self.queue.qsize(),
+            'requests': self.requests,
+            'images': self.images,
+            'batches': self.batches,
+            'batch_size': round(self.images / self.batches, 2) if self.batches else 0.,
+            'latency_avg': round(self.latency_total / self.requests, 4) if self.requests else 0.,
+            'latency_max': round(self.latency_max, 4),
+        }
+        if reset:
+            self.requests = 0
+            self.images = 0
+            self.batches = 0
+            self.latency_total = 0.
+            self.latency_max = 0.
+        return out
+
+
+def start_ocr_server(port=22268, report_interval=60):
+    import gevent
     import zerorpc
     import zmq
     from module.ocr.al_ocr import AlOcr
     from module.ocr.models import OcrModel
 
     class OCRServer(OcrModel):
+        """
+        Accept requests of all versions, see RPC_VERSION.
+        Version 1 requests have no alphabet argument and send pickled images.
+        """
+
+        def __init__(self):
+            # Key: lang, value: OcrBatcher
+            self.batchers = {}
+            # Key: lang, value: alphabet set by version 1 clients
+            self.alphabets = {}
+
+        def batcher(self, lang) -> OcrBatcher:
+            if lang not in self.batchers:
+                self.batchers[lang] = OcrBatcher(self.__getattribute__(lang))
+            return self.batchers[lang]
+
         def hello(self):
             return "hello"
 
-        def ocr(self, lang, img_fp):
-            img_fp = pickle.loads(img_fp)
+        def version(self):
+            return RPC_VERSION
+
+        def _parse(self, lang, args):
+            """
+            Args:
+                lang (str):
+                args (tuple): (img,) in version 1, (cand_alphabet, img) in version 2.
+                    img can be a list of images.
+
+            Returns:
+                str: Alphabet.
+                np.ndarray, list[np.ndarray]:
+            """
+            if len(args) == 1:
+                alphabet, img, load = self.alphabets.get(lang), args[0], pickle.loads
+            else:
+                alphabet, img = args
+                load = unpack_image
+            if isinstance(img, list):
+                return alphabet, [load(i) for i in img]
+            return alphabet, load(img)
+
+        def ocr(self, lang, *args):
+            cand_alphabet, img_fp = self._parse(lang, args)
             cnocr: AlOcr = self.__getattribute__(lang)
+            cnocr.set_cand_alphabet(cand_alphabet)
             return cnocr.ocr(img_fp)
 
-        def ocr_for_single_line(self, lang, img_fp):
-            img_fp = pickle.loads(img_fp)
-            cnocr: AlOcr = self.__getattribute__(lang)
-            return cnocr.ocr_for_single_line(img_fp)
+        def ocr_for_single_line(self, lang, *args):
+            cand_alphabet, img_fp = self._parse(lang, args)
+            return self.batcher(lang).ocr_for_single_lines(cand_alphabet, [img_fp])[0]
 
-        def ocr_for_single_lines(self, lang, img_list):
-            img_list = [pickle.loads(img_fp) for img_fp in img_list]
-            cnocr: AlOcr = self.__getattribute__(lang)
-            return cnocr.ocr_for_single_lines(img_list)
+        def ocr_for_single_lines(self, lang, *args):
+            cand_alphabet, img_list = self._parse(lang, args)
+            return self.batcher(lang).ocr_for_single_lines(cand_alphabet, img_list)
 
         def set_cand_alphabet(self, lang, cand_alphabet):
-            cnocr: AlOcr = self.__getattribute__(lang)
-            return cnocr.set_cand_alphabet(cand_alphabet)
+            # Version 1 only
+            self.alphabets[lang] = cand_alphabet
 
         def debug(self, lang, img_list):
-            img_list = [pickle.loads(img_fp) for img_fp in img_list]
+            # Version 1 only
             cnocr: AlOcr = self.__getattribute__(lang)
-            return cnocr.debug(img_list)
-
-    server = zerorpc.Server(OCRServer())
+            return cnocr.debug([pickle.loads(img_fp) for img_fp in img_list])
+
+        def stats(self):
+            """
+            Returns:
+                dict: Key: lang, value: dict of queue depth, request count, batch size and latency.
+            """
+            return {lang: batcher.stats() for lang, batcher in self.batchers.items()}
+
+    ocr_server = OCRServer()
+
+    def report():
+        while 1:
+            gevent.sleep(report_interval)
+            for lang, batcher in ocr_server.batchers.items():
+                stats = batcher.stats(reset=True)
+                if stats['requests']:
+                    logger.info(f'Ocr server [{lang}] ' + ', '.join(f'{k}={v}' for k, v in stats.items()))
+
+    server = zerorpc.Server(ocr_server)
     try:
         server.bind(f"tcp://*:{port}")
     except zmq.error.ZMQError:
         logger.error(f"Ocr server cannot bind on port {port}")
         return
     logger.info(f"Ocr server listen on port {port}")
+    if report_interval:
+        gevent.spawn(report)
     server.run()
 
 
@@ -2,6 +2,7 @@ from datetime import timedelta
 
 from scipy import signal
 
+from module.base.asset_pack import ASSET_PACK
 from module.base.decorator import cached_property
 from module.base.utils import *
 from module.logger import logger
@@ -302,7 +303,7 @@ def get_research_cost_jp(image):
     templates = load_folder(folder)
     costs = {'coin': False, 'cube': False, 'plate': False}
     for name, template in templates.items():
-        template = load_image(template)
+        template = ASSET_PACK.load_image(template)
         template = crop(resize(template, size_template), area_template)
         sim = match_template(image=image,
                              template=template,
@@ -340,7 +341,7 @@ def get_research_ship_jp(image):
     ship = ''
     for name, template in templates.items():
         sim = match_template(image=image,
-                             template=load_image(template),
+                             template=ASSET_PACK.load_image(template),
                              area=DETAIL_BLUEPRINT.area,
                              offset=(10, 10),
                              threshold=0.9)
@@ -1,6 +1,8 @@
 import numpy as np
 
+from module.base.asset_pack import ASSET_PACK
 from module.base.button import ButtonGrid
+from module.base.decorator import cached_property, del_cached_property
 from module.base.utils import *
 from module.logger import logger
 from module.ocr.ocr import Digit, DigitYuv
@@ -149,6 +151,7 @@ class ItemGrid:
         self.next_template_index = len(self.templates.keys())
         for name, template in templates.items():
             self.templates[name] = crop(template.image, area=self.template_area)
+            self.colors[name] = cv2.mean(self.templates[name])[:3]
             self.templates_hit[name] = 0
             if name.isdigit() and int(name) > self.next_template_index:
                 self.next_template_index = int(name)
@@ -181,8 +184,9 @@ class ItemGrid:
         for name, image in data.items():
             if name in self.templates:
                 continue
-            image = load_image(image)
-            image = crop(image, area=self.template_area)
+            image = ASSET_PACK.load_image(image)
+            # Crop as a view, templates in asset pack are shared by processes
+            image = crop(image, area=self.template_area, copy=False)
             self.colors[name] = cv2.mean(image)[:3]
             self.templates[name] = image
             self.templates_hit[name] = 0
@@ -191,6 +195,22 @@ class ItemGrid:
             self.next_template_index += 1
         self.next_template_index = max(self.next_template_index, max_digit + 1)
         logger.attr('next_template_index', self.next_template_index)
+        del_cached_property(self, '_template_index')
+
+    @cached_property
+    def _template_index(self):
+        """
+        Templates packed into arrays, rebuilt when new templates added.
+
+        Returns:
+            np.ndarray: Template names.
+            np.ndarray: Average colors in int, shape (n, 3).
+            np.ndarray: If template name is digit, which means auto-generated.
+        """
+        names = list(self.templates.keys())
+        colors = np.array([self.colors[name] for name in names], dtype=float).reshape(-1, 3).astype(int)
+        is_digit = np.array([name.isdigit() for name in names], dtype=bool)
+        return np.array(names, dtype=str), colors, is_digit
 
     def load_cost_template_folder(self, folder):
         """
@@ -202,7 +222,7 @@ class ItemGrid:
         for name, image in data.items():
             if name in self.cost_templates:
                 continue
-            image = load_image(image)
+            image = ASSET_PACK.load_image(image)
             self.cost_templates[name] = image
             self.cost_templates_hit[name] = 0
             if name.isdigit():
@@ -224,17 +244,20 @@ class ItemGrid:
         if similarity is None:
             similarity = self.similarity
         color = cv2.mean(crop(image, self.template_area))[:3]
+        names, colors, is_digit = self._template_index
         # Match frequently hit templates first
-        names = np.array(list(self.templates.keys()))[np.argsort(list(self.templates_hit.values()))][::-1]
+        order = np.argsort(np.fromiter(self.templates_hit.values(), dtype=int, count=len(names)))[::-1]
         # Match known templates first
-        names = [name for name in names if not name.isdigit()] + [name for name in names if name.isdigit()]
-        for name in names:
-            if color_similar(color1=color, color2=self.colors[name], threshold=30):
-                res = cv2.matchTemplate(image, self.templates[name], cv2.TM_CCOEFF_NORMED)
-                _, sim, _, _ = cv2.minMaxLoc(res)
-                if sim > similarity:
-                    self.templates_hit[name] += 1
-                    return name
+        order = order[np.argsort(is_digit[order], kind='stable')]
+        # Same as color_similar(threshold=30), but on all templates at once
+        diff = np.array(color).astype(int) - colors[order]
+        diff = np.max(np.maximum(diff, 0), axis=1) - np.min(np.minimum(diff, 0), axis=1)
+        for name in names[order[diff <= 30]]:
+            res = cv2.matchTemplate(image, self.templates[name], cv2.TM_CCOEFF_NORMED)
+            _, sim, _, _ = cv2.minMaxLoc(res)
+            if sim > similarity:
+                self.templates_hit[name] += 1
+                return name
 
         self.next_template_index += 1
         name = str(self.next_template_index)
@@ -243,6 +266,7 @@ class ItemGrid:
         self.colors[name] = cv2.mean(image)[:3]
         self.templates[name] = image
         self.templates_hit[name] = self.templates_hit.get(name, 0) + 1
+        del_cached_property(self, '_template_index')
         return name
 
     def extract_template(self, image, folder=None):
@@ -1,4 +1,4 @@
-from module.base.button import Button
+from module.base.button import Button, ButtonSet
 from module.base.decorator import run_once
 from module.base.timer import Timer
 from module.coalition.assets import FLEET_PREPARATION as COALITION_FLEET_PREPARATION
@@ -142,6 +142,9 @@ class UI(InfoHandler):
         def rotation_check():
             self.device.get_orientation()
 
+        pages = [page for page in Page.iter_pages() if page.check_button is not None]
+        page_check = ButtonSet([page.check_button for page in pages], name='PAGE_CHECK')
+
         timeout = Timer(10, count=20).start()
         while 1:
             if skip_first_screenshot:
@@ -156,13 +159,12 @@ class UI(InfoHandler):
                 break
 
             # Known pages
-            for page in Page.iter_pages():
-                if page.check_button is None:
-                    continue
-                if self.ui_page_appear(page=page):
-                    logger.attr("UI", page.name)
-                    self.ui_current = page
-                    return page
+            button = self.appear_any(page_check, offset=(30, 30))
+            if button is not None:
+                page = pages[page_check.buttons.index(button)]
+                logger.attr("UI", page.name)
+                self.ui_current = page
+                return page
 
             # Unknown page but able to handle
             logger.info("Unknown ui page")
@@ -43,6 +43,7 @@ from pywebio.session import (
 )
 
 import module.webui.lang as lang
+from module.base.asset_pack import start_asset_pack_process
 from module.config.config import AzurLaneConfig, Function
 from module.config.env import IS_ON_PHONE_CLOUD
 from module.config.utils import (
@@ -1378,6 +1379,8 @@ def startup():
         init_discord_rpc()
     if State.deploy_config.StartOcrServer:
         start_ocr_server_process(State.deploy_config.OcrServerPort)
+    # Build shared asset packs for Alas processes
+    start_asset_pack_process()
     if (
         State.deploy_config.EnableRemoteAccess
         and State.deploy_config.Password is not None
@@ -1,13 +1,12 @@
 import argparse
 import os
-import queue
 import threading
-from multiprocessing import Process
+from multiprocessing import Pipe, Process
 from typing import Dict, List, Union
 
 import inflection
 from filelock import FileLock
-from rich.console import Console, ConsoleRenderable
+from rich.console import Console
 
 from module.config.utils import filepath_config
 from module.logger import logger, set_file_logger, set_func_logger
@@ -16,15 +15,124 @@ from module.submodule.utils import get_available_mod, get_available_mod_func, ge
 from module.webui.setting import State
 
 
+class LogPipeSender:
+    """
+    Send logs through a pipe in batches, from a background thread.
+    Logging is called frequently in map detection, batches save lots of IPC round-trips.
+    """
+
+    def __init__(self, conn, interval=0.05, batch=100):
+        """
+        Args:
+            conn (Connection): Sending end of the pipe.
+            interval (float): Seconds to wait for more logs before sending.
+            batch (int): Send immediately if buffered logs reach this.
+        """
+        self.conn = conn
+        self.interval = interval
+        self.batch = batch
+        self.buffer = []
+        self.condition = threading.Condition()
+        # Keep batches in order, without holding `condition` while sending
+        self.send_lock = threading.Lock()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def put(self, log) -> None:
+        with self.condition:
+            self.buffer.append(log)
+            if len(self.buffer) >= self.batch:
+                self.condition.notify()
+
+    def flush(self) -> None:
+        with self.send_lock:
+            with self.condition:
+                logs, self.buffer = self.buffer, []
+            # Sending blocks if GUI reads slowly, put() should not wait for it
+            if logs:
+                try:
+                    self.conn.send(logs)
+                except (BrokenPipeError, EOFError, OSError):
+                    pass
+
+    def _loop(self) -> None:
+        while 1:
+            with self.condition:
+                if len(self.buffer) < self.batch:
+                    self.condition.wait(timeout=self.interval)
+            self.flush()
+
+
+class LogRingBuffer:
+    """
+    Fixed size ring buffer of logs, numbered by a monotonic sequence.
+
+    Readers keep their own cursor and get only new logs from read(),
+    old logs are overwritten in place, so trimming never copies or shifts positions.
+    """
+
+    def __init__(self, size=400):
+        self.size = size
+        self.buffer = [None] * size
+        # Sequence number of the next log
+        self.end = 0
+        self.lock = threading.Lock()
+
+    @property
+    def start(self) -> int:
+        """
+        Sequence number of the oldest log.
+        """
+        return max(self.end - self.size, 0)
+
+    def __len__(self):
+        return self.end - self.start
+
+    def append(self, log) -> None:
+        with self.lock:
+            self.buffer[self.end % self.size] = log
+            self.end += 1
+
+    def extend(self, logs) -> None:
+        with self.lock:
+            for log in logs:
+                self.buffer[self.end % self.size] = log
+                self.end += 1
+
+    def last(self):
+        """
+        Returns:
+            The latest log, or None if empty.
+        """
+        with self.lock:
+            if self.end == 0:
+                return None
+            return self.buffer[(self.end - 1) % self.size]
+
+    def read(self, cursor=0):
+        """
+        Args:
+            cursor (int): Sequence number from previous read(), 0 to read all.
+
+        Returns:
+            int: New cursor.
+            list: Logs after cursor, starts from the oldest one if logs before cursor are overwritten.
+        """
+        with self.lock:
+            start = max(cursor, self.start)
+            logs = [self.buffer[index % self.size] for index in range(start, self.end)]
+            return self.end, logs
+
+
 class ProcessManager:
     _processes: Dict[str, "ProcessManager"] = {}
 
     def __init__(self, config_name: str = "alas") -> None:
         self.config_name = config_name
-        self._renderable_queue: queue.Queue[ConsoleRenderable] = State.manager.Queue()
-        self.renderables: List[ConsoleRenderable] = []
+        self._log_reader = None
+        # Element: dict for plain log records, see StructuredLogHandler, or ConsoleRenderable, or str
         self.renderables_max_length = 400
-        self.renderables_reduce_length = 80
+        self.renderables = LogRingBuffer(size=self.renderables_max_length)
         self._process: Process = None
         self.thd_log_queue_handler: threading.Thread = None
 
@@ -32,26 +140,25 @@ class ProcessManager:
         if not self.alive:
             if func is None:
                 func = get_config_mod(self.config_name)
+            self._log_reader, log_writer = Pipe(duplex=False)
             self._process = Process(
                 target=ProcessManager.run_process,
                 args=(
                     self.config_name,
                     func,
-                    self._renderable_queue,
+                    log_writer,
                     ev,
                 ),
             )
             self._process.start()
+            # Only child process holds the sending end, so reader gets EOF when child exits
+            log_writer.close()
             self.start_log_queue_handler()
 
     def start_log_queue_handler(self):
-        if (
-            self.thd_log_queue_handler is not None
-            and self.thd_log_queue_handler.is_alive()
-        ):
-            return
+        # Each process has its own pipe, previous handler exits on EOF of previous pipe
         self.thd_log_queue_handler = threading.Thread(
-            target=self._thread_log_queue_handler
+            target=self._thread_log_queue_handler, args=(self._log_reader,)
         )
         self.thd_log_queue_handler.start()
 
@@ -71,17 +178,40 @@ class ProcessManager:
                     )
         logger.info(f"[{self.config_name}] exited")
 
-    def _thread_log_queue_handler(self) -> None:
-        while self.alive:
+    def _thread_log_queue_handler(self, reader) -> None:
+        while 1:
             try:
-                log = self._renderable_queue.get(timeout=1)
-            except queue.Empty:
-                continue
-            self.renderables.append(log)
-            if len(self.renderables) > self.renderables_max_length:
-                self.renderables = self.renderables[self.renderables_reduce_length :]
+                if not reader.poll(1):
+                    if self.alive:
+                        continue
+                    else:
+                        break
+                logs = reader.recv()
+            except (EOFError, OSError):
+                break
+            # Store plain records, they are rendered only when someone is viewing, see RichLog.put_log()
+            self.renderables.extend(logs)
+        reader.close()
         logger.info("End of log queue handler loop")
 
+    @staticmethod
+    def log_to_text(log) -> str:
+        """
+        Args:
+            log (dict, ConsoleRenderable, str): Element in `renderables`
+
+        Returns:
+            str: Log in plain text
+        """
+        if isinstance(log, dict):
+            return log["message"]
+        if isinstance(log, str):
+            return log
+        console = Console(no_color=True)
+        with console.capture() as capture:
+            console.print(log)
+        return capture.get()
+
     @property
     def alive(self) -> bool:
         if self._process is not None:
@@ -96,10 +226,7 @@ class ProcessManager:
         elif len(self.renderables) == 0:
             return 2
         else:
-            console = Console(no_color=True)
-            with console.capture() as capture:
-                console.print(self.renderables[-1])
-            s = capture.get().strip()
+            s = self.log_to_text(self.renderables.last()).strip()
             if s.endswith("Reason: Manual stop"):
                 return 2
             elif s.endswith("Reason: Finish"):
@@ -120,7 +247,7 @@ class ProcessManager:
 
     @staticmethod
     def run_process(
-        config_name, func: str, q: queue.Queue, e: threading.Event = None
+        config_name, func: str, conn, e: threading.Event = None
     ) -> None:
         parser = argparse.ArgumentParser()
         parser.add_argument(
@@ -136,7 +263,8 @@ class ProcessManager:
             logger.info("Electron detected, remove log output to stdout")
             from module.logger import console_hdlr
             logger.removeHandler(console_hdlr)
-        set_func_logger(func=q.put)
+        sender = LogPipeSender(conn)
+        set_func_logger(func=sender.put, structured=True)
 
         from module.config.config import AzurLaneConfig
 
@@ -182,6 +310,9 @@ class ProcessManager:
             logger.info(f"[{config_name}] exited. Reason: Finish\n")
         except Exception as e:
             logger.exception(e)
+        finally:
+            sender.flush()
+            logger.flush()
 
     @classmethod
     def running_instances(cls) -> List["ProcessManager"]:
@@ -10,7 +10,8 @@ from pywebio.output import *
 from pywebio.session import eval_js, local, run_js
 from rich.console import ConsoleRenderable
 
-from module.logger import HTMLConsole, Highlighter, WEB_THEME
+from module.base.decorator import cached_property
+from module.logger import HTMLConsole, Highlighter, WEB_THEME, get_web_handler
 from module.webui.lang import t
 from module.webui.pin import put_checkbox, put_input, put_select, put_textarea
 from module.webui.process_manager import ProcessManager
@@ -98,7 +99,14 @@ class RichLog:
         else:
             self.terminal_theme = LIGHT_TERMINAL_THEME
 
-    def render(self, renderable: ConsoleRenderable) -> str:
+    @cached_property
+    def record_handler(self):
+        return get_web_handler()
+
+    def render(self, renderable: Union[dict, ConsoleRenderable, str]) -> str:
+        if isinstance(renderable, dict):
+            # Plain log record from alas process, render it only when someone is viewing
+            renderable = self.record_handler.render_record(renderable)
         with self.console.capture():
             self.console.print(renderable)
 
@@ -190,21 +198,19 @@ class RichLog:
         yield
         try:
             while True:
-                last_idx = len(pm.renderables)
-                html = "".join(map(self.render, pm.renderables[:]))
+                cursor, logs = pm.renderables.read()
+                html = "".join(map(self.render, logs))
                 self.reset()
                 self.extend(html)
-                counter = last_idx
+                # Re-render all logs sometimes, to limit the amount of elements in browser
+                counter = len(logs)
                 while counter < pm.renderables_max_length * 2:
                     yield
-                    idx = len(pm.renderables)
-                    if idx < last_idx:
-                        last_idx -= pm.renderables_reduce_length
-                    if idx != last_idx:
-                        html = "".join(map(self.render, pm.renderables[last_idx:idx]))
+                    cursor, logs = pm.renderables.read(cursor)
+                    if logs:
+                        html = "".join(map(self.render, logs))
                         self.extend(html)
-                        counter += idx - last_idx
-                        last_idx = idx
+                        counter += len(logs)
         except SessionException:
             pass
 